@@ -245,6 +245,15 @@ class AdvancedCryptoDashboard:
             self.sentiment_analyzer = AdvancedSentimentAnalyzer()
         except Exception as e:
             self.sentiment_analyzer = None
+        
+        # Optional local prediction server (python -m src.models.prediction_server)
+        self.prediction_client = None
+        if os.getenv('PREDICTION_SERVER_URL'):
+            try:
+                from models.prediction_server import PredictionClient
+                self.prediction_client = PredictionClient(os.getenv('PREDICTION_SERVER_URL'))
+            except Exception as e:
+                self.prediction_client = None
     
     def log_message(self, message, level="INFO"):
         """Add message to log"""
@@ -719,6 +728,10 @@ def initialize_session_state():
     if 'last_sentiment' not in st.session_state:
         st.session_state.last_sentiment = None
     
+    if 'prediction_cache' not in st.session_state:
+        from models.prediction_cache import PredictionCache
+        st.session_state.prediction_cache = PredictionCache()
+    
     if 'show_prediction_result' not in st.session_state:
         st.session_state.show_prediction_result = False
     
@@ -1025,8 +1038,28 @@ def display_market_overview():
     
     st.markdown('</div>', unsafe_allow_html=True)
 
+# Bump when the heuristic in generate_prediction changes, so cached results expire
+HEURISTIC_MODEL_VERSION = "heuristic-v1"
+PREDICTION_BAR_INTERVAL = "1min"
+
 def generate_prediction(symbol, current_price, stats_24h):
-    """Generate AI-powered price prediction"""
+    """Generate AI-powered price prediction (memoized until the next bar closes)"""
+    cache = st.session_state.prediction_cache
+    # Keyed on the open time (naive UTC) of the last closed bar, like PricePredictor
+    bar = pd.Timedelta(PREDICTION_BAR_INTERVAL)
+    last_bar = pd.Timestamp.now(tz='UTC').tz_localize(None).floor(bar) - bar
+    
+    cached = cache.get(HEURISTIC_MODEL_VERSION, symbol, last_bar)
+    if cached is not None:
+        st.session_state.dashboard.log_message(f"♻️ Reusing prediction for {symbol} (bar {last_bar.strftime('%H:%M')} UTC)")
+        return cached
+    
+    prediction_data = compute_prediction(symbol, current_price, stats_24h)
+    cache.put(HEURISTIC_MODEL_VERSION, symbol, last_bar, prediction_data)
+    return prediction_data
+
+def compute_prediction(symbol, current_price, stats_24h):
+    """Run the prediction heuristic"""
     dashboard = st.session_state.dashboard
     dashboard.log_message(f"🤖 Generating AI prediction for {symbol}")
     
@@ -1058,6 +1091,13 @@ def generate_prediction(symbol, current_price, stats_24h):
         factors.append("Price near 24h low - Support possible")
         range_score *= 0.8
     
+    # Trained model signal from the prediction server, when one is running
+    if dashboard.prediction_client is not None:
+        ml_predictions = dashboard.prediction_client.predict(symbols=[symbol])
+        if ml_predictions and 'error' not in ml_predictions[0]:
+            ml_prediction = ml_predictions[0]
+            factors.append(f"ML Model: {'UP' if ml_prediction['prediction'] == 1 else 'DOWN'} ({ml_prediction['confidence']:.0%} confidence)")
+    
     # Combine all factors
     total_score = trend_score + volatility_score + volume_score + range_score
     
@@ -1442,6 +1482,7 @@ def main():
         with col2:
             if st.button("🗑️ Clear All", key="clear_btn", use_container_width=True):
                 st.session_state.prediction_history = []
+                st.session_state.prediction_cache.clear()
                 st.session_state.last_prediction = None
                 st.session_state.last_sentiment = None
                 st.session_state.show_prediction_result = False
@@ -1463,6 +1504,8 @@ def main():
         st.success("✅ AI Engine: Active")
         st.info(f"**Last Update:** {st.session_state.last_update.strftime('%H:%M:%S')}")
         st.info(f"**Log Entries:** {len(st.session_state.app_logs)}")
+        cache_stats = st.session_state.prediction_cache.stats()
+        st.info(f"**Prediction Cache:** {cache_stats['hits']} hits / {cache_stats['misses']} misses")
         st.info(f"**Alerts:** {len(st.session_state.price_alerts)} active")
     
     # Main content layout
@@ -6,17 +6,18 @@ class HistoricalDataCollector:
         self.connector = BinanceConnector(api_key, api_secret)
 
     
-    def get_historical_data(self, symbol='BTCUSDT', interval='1h', days=90):    
+    def get_historical_data(self, symbol='BTCUSDT', interval='1h', days=90, start_str=None, end_str=None):    
         """Fetch 90 days of historical data for analysis and modeling"""
         try:
-            # Calculate start date
-            start_str = f"{days} days ago UTC"
+            # Calculate start date (an explicit window overrides `days`)
+            start_str = start_str or f"{days} days ago UTC"
             
             # Get historical klines data
             klines = self.connector.client.get_historical_klines(
                 symbol=symbol,
                 interval=interval,
-                start_str=start_str
+                start_str=start_str,
+                end_str=end_str
             )
             
             # Define columns
@@ -0,0 +1,209 @@
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+# Bars per day for the kline intervals we use
+BARS_PER_DAY = {'1m': 1440, '5m': 288, '15m': 96, '30m': 48, '1h': 24, '4h': 6, '1d': 1}
+
+
+def heuristic_scores(df, bars_per_day=24):
+    """
+    Vectorized version of app.generate_prediction's total_score for every bar,
+    using trailing 24h windows in place of the live 24h ticker stats
+    """
+    close = df['close']
+
+    # Trend: sign of the least-squares slope over the last 5 closes
+    slope = (2 * close - 2 * close.shift(4) + close.shift(1) - close.shift(3))
+    trend_score = np.where(slope > 0, 0.7, np.where(slope < 0, -0.7, 0.0))
+
+    # Volatility: absolute 24h change in percent
+    change_24h_pct = (close / close.shift(bars_per_day) - 1) * 100
+    volatility_score = change_24h_pct.abs() / 100 * 0.5
+
+    # Volume tiers on trailing 24h volume
+    volume_24h = df['volume'].rolling(bars_per_day, min_periods=1).sum()
+    volume_score = np.where(volume_24h > 10000000, 0.3, np.where(volume_24h > 5000000, 0.1, -0.1))
+
+    # Position inside the 24h range, damped near the extremes
+    high_24h = df['high'].rolling(bars_per_day, min_periods=1).max()
+    low_24h = df['low'].rolling(bars_per_day, min_periods=1).min()
+    range_position = (close - low_24h) / (high_24h - low_24h).replace(0, np.nan)
+    range_score = (range_position - 0.5) * 2
+    range_score = np.where((range_position > 0.7) | (range_position < 0.3), range_score * 0.8, range_score)
+
+    total_score = trend_score + volatility_score + volume_score + range_score
+    return pd.Series(total_score, index=df.index).fillna(0)
+
+
+def heuristic_signals(df, bars_per_day=24, threshold=0.1, allow_short=False):
+    """+1 for UP calls (score > threshold), -1 for DOWN calls when shorting, else 0"""
+    scores = heuristic_scores(df, bars_per_day)
+    signals = np.where(scores > threshold, 1, np.where(scores < -threshold, -1 if allow_short else 0, 0))
+    return pd.Series(signals, index=df.index)
+
+
+def model_signals(predictor, df, feature_engineer, probability_threshold=0.5, allow_short=False, batch_size=50000):
+    """
+    Score every bar with a PricePredictor in large vectorized batches
+    """
+    data = feature_engineer.create_technical_indicators(df)
+    columns = predictor.feature_columns or [c for c in data.columns if c not in
+                                            ['timestamp', 'open', 'high', 'low', 'close', 'volume']]
+    aligned = data.reindex(columns=columns)
+    features = aligned.fillna(0)
+
+    probability_up = np.empty(len(features))
+    up_index = list(predictor.model.classes_).index(1)
+    for start in range(0, len(features), batch_size):
+        batch = features.iloc[start:start + batch_size]
+        probability_up[start:start + batch_size] = predictor.predict_proba(batch)[:, up_index]
+
+    signals = np.where(probability_up > probability_threshold, 1, -1 if allow_short else 0)
+    # Indicators are undefined during warm-up; stay flat there. Columns the
+    # data lacks entirely (e.g. sentiment) are zero-filled for the model and
+    # don't count as warm-up
+    present = [c for c in columns if c in data.columns]
+    warm = aligned[present].notna().all(axis=1).to_numpy()
+    return pd.Series(np.where(warm, signals, 0), index=df.index)
+
+
+class VectorizedBacktester:
+    """
+    Backtests a per-bar signal series with array operations only.
+
+    A signal at bar t is acted on at t's close and held for
+    ``holding_periods`` bars. Overlapping signals are handled as equal
+    tranches (each signal controls 1/holding_periods of capital), so
+    the position at bar j is the mean of the previous ``holding_periods``
+    signals. Fees and slippage are charged on every change in position.
+    """
+
+    def __init__(self, holding_periods=4, fee_bps=10, slippage_bps=5, bars_per_year=24 * 365):
+        self.holding_periods = holding_periods
+        self.fee_bps = fee_bps
+        self.slippage_bps = slippage_bps
+        self.bars_per_year = bars_per_year
+
+    def run(self, df, signals):
+        close = df['close'].to_numpy(dtype=float)
+        signals = np.asarray(signals, dtype=float)
+        h = self.holding_periods
+        cost_rate = (self.fee_bps + self.slippage_bps) / 10000
+
+        # position[j] = mean(signals[j-h .. j-1]) via a cumulative sum
+        csum = np.concatenate([[0.0], np.cumsum(signals)])
+        idx = np.arange(len(signals))
+        position = (csum[idx] - csum[np.maximum(idx - h, 0)]) / h
+
+        bar_returns = np.zeros(len(close))
+        bar_returns[1:] = close[1:] / close[:-1] - 1
+
+        turnover = np.abs(np.diff(np.concatenate([[0.0], position])))
+        strategy_returns = position * bar_returns - turnover * cost_rate
+        equity = np.cumprod(1 + strategy_returns)
+
+        # Per-signal outcome over its own holding window, round-trip costs included
+        forward_return = np.full(len(close), np.nan)
+        forward_return[:-h] = close[h:] / close[:-h] - 1
+        trade_mask = (signals != 0) & ~np.isnan(forward_return)
+        trade_returns = signals[trade_mask] * forward_return[trade_mask] - 2 * cost_rate
+
+        index = df['timestamp'] if 'timestamp' in df.columns else df.index
+        result = {
+            'equity': pd.Series(equity, index=index, name='equity'),
+            'returns': pd.Series(strategy_returns, index=index, name='returns'),
+            'position': pd.Series(position, index=index, name='position'),
+            'metrics': self._metrics(equity, strategy_returns, position, trade_returns, close),
+        }
+        return result
+
+    def _metrics(self, equity, returns, position, trade_returns, close):
+        n_bars = len(returns)
+        running_max = np.maximum.accumulate(equity) if n_bars else equity
+        drawdown = equity / running_max - 1 if n_bars else np.array([0.0])
+        std = returns.std()
+
+        return {
+            'total_return': round(float(equity[-1] - 1), 4) if n_bars else 0.0,
+            'annualized_return': round(float(equity[-1] ** (self.bars_per_year / n_bars) - 1), 4) if n_bars and equity[-1] > 0 else 0.0,
+            'sharpe_ratio': round(float(returns.mean() / std * np.sqrt(self.bars_per_year)), 3) if std > 0 else 0.0,
+            'max_drawdown': round(float(drawdown.min()), 4),
+            'trades': int(len(trade_returns)),
+            'hit_rate': round(float((trade_returns > 0).mean()), 3) if len(trade_returns) else 0.0,
+            'avg_trade_return': round(float(trade_returns.mean()), 5) if len(trade_returns) else 0.0,
+            'exposure': round(float(np.abs(position).mean()), 3),
+            'buy_and_hold_return': round(float(close[-1] / close[0] - 1), 4) if n_bars else 0.0,
+        }
+
+
+def run_backtest_job(job):
+    """
+    One independent backtest (picklable, for the process pool).
+    job keys: data (DataFrame) or path, signal ('heuristic' | 'model'),
+    interval, model_path, holding_periods, fee_bps, slippage_bps, allow_short
+    """
+    start = time.time()
+    df = job.get('data')
+    if df is None:
+        df = pd.read_csv(job['path'], parse_dates=['timestamp'])
+    df = df.sort_values('timestamp').reset_index(drop=True)
+
+    bars_per_day = BARS_PER_DAY.get(job.get('interval', '1h'), 24)
+    allow_short = job.get('allow_short', False)
+
+    if job.get('signal', 'heuristic') == 'model':
+        from .feature_engineering import FeatureEngineer
+        from .predict import PricePredictor
+        predictor = PricePredictor(job.get('model_path', 'src/models/saved_models/random_forest.pkl'))
+        signals = model_signals(predictor, df, FeatureEngineer(), allow_short=allow_short)
+    else:
+        signals = heuristic_signals(df, bars_per_day, allow_short=allow_short)
+
+    backtester = VectorizedBacktester(
+        holding_periods=job.get('holding_periods', 4),
+        fee_bps=job.get('fee_bps', 10),
+        slippage_bps=job.get('slippage_bps', 5),
+        bars_per_year=bars_per_day * 365
+    )
+    result = backtester.run(df, signals)
+    result['symbol'] = job.get('symbol', 'BTCUSDT')
+    result['signal'] = job.get('signal', 'heuristic')
+    result['duration_seconds'] = time.time() - start
+    return result
+
+
+def run_many(jobs, max_workers=None):
+    """Run independent backtests in a process pool; returns results in job order"""
+    if len(jobs) == 1 or max_workers == 1:
+        return [run_backtest_job(job) for job in jobs]
+    with ProcessPoolExecutor(max_workers=max_workers) as pool:
+        return list(pool.map(run_backtest_job, jobs))
+
+
+def summarize(results):
+    """Metrics of several backtests as one DataFrame"""
+    rows = []
+    for result in results:
+        row = {'symbol': result.get('symbol'), 'signal': result.get('signal')}
+        row.update(result['metrics'])
+        rows.append(row)
+    return pd.DataFrame(rows)
+
+# Test function
+def test_backtest():
+    print("🧪 Testing Vectorized Backtester...")
+
+    path = 'data/historical/btc_historical_20251107.csv'
+    results = run_many([
+        {'symbol': 'BTCUSDT', 'path': path, 'signal': 'heuristic', 'interval': '1h'},
+        {'symbol': 'BTCUSDT', 'path': path, 'signal': 'heuristic', 'interval': '1h', 'allow_short': True},
+    ], max_workers=2)
+
+    print(summarize(results).to_string(index=False))
+    return results
+
+if __name__ == "__main__":
+    test_backtest()
@@ -0,0 +1,182 @@
+import json
+import os
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+import pandas as pd
+
+from .feature_engineering import FeatureEngineer, StreamingFeatureState
+
+
+def iter_csv_chunks(path, chunk_size=50000):
+    """Stream bars from a CSV file in time-ordered chunks"""
+    for chunk in pd.read_csv(path, chunksize=chunk_size, parse_dates=['timestamp']):
+        yield chunk
+
+
+def iter_api_chunks(symbol='BTCUSDT', interval='1m', days=365, chunk_days=7, collector=None):
+    """Download history window by window instead of in a single request"""
+    if collector is None:
+        from src.data_collection.historical_data import HistoricalDataCollector
+        collector = HistoricalDataCollector()
+
+    end = datetime.now(timezone.utc)
+    window_start = end - timedelta(days=days)
+    while window_start < end:
+        window_end = min(window_start + timedelta(days=chunk_days), end)
+        chunk = collector.get_historical_data(
+            symbol=symbol, interval=interval,
+            start_str=window_start.strftime('%Y-%m-%d %H:%M:%S'),
+            end_str=window_end.strftime('%Y-%m-%d %H:%M:%S')
+        )
+        if chunk is not None and len(chunk):
+            # Window edges are inclusive on both sides
+            yield chunk[chunk['timestamp'] < window_end]
+        window_start = window_end
+
+
+class ChunkedDatasetBuilder:
+    """
+    Builds training shards without holding the full history in memory.
+
+    Each chunk is prefixed with the last bars of the previous chunk, so
+    rolling indicators see the same history they would on the full frame,
+    and the last ``lookahead_periods`` bars are held back until the next
+    chunk supplies their future closes. The shards are therefore
+    row-for-row identical to running FeatureEngineer on the whole series.
+    """
+
+    def __init__(self, output_dir='data/processed/shards', lookahead_periods=4, threshold=0.01):
+        self.output_dir = output_dir
+        self.lookahead_periods = lookahead_periods
+        self.threshold = threshold
+        self.warmup_periods = StreamingFeatureState.WARMUP_PERIODS
+        self.engineer = FeatureEngineer()
+
+    def _manifest_path(self):
+        return os.path.join(self.output_dir, 'manifest.json')
+
+    def load_manifest(self):
+        if os.path.exists(self._manifest_path()):
+            with open(self._manifest_path(), 'r', encoding='utf-8') as f:
+                return json.load(f)
+        return {'shards': [], 'feature_columns': None}
+
+    def _save_manifest(self, manifest):
+        tmp_path = self._manifest_path() + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, indent=2, default=str)
+        os.replace(tmp_path, self._manifest_path())
+
+    def _write_shard(self, features, target, timestamps, symbol, shard_index):
+        filename = f'{symbol}_{shard_index:05d}.npz'
+        np.savez(
+            os.path.join(self.output_dir, filename),
+            X=features.to_numpy(dtype=np.float64),
+            y=target.to_numpy(dtype=np.int8),
+            timestamp=timestamps.to_numpy(dtype='datetime64[ns]').astype(np.int64),
+            columns=np.array(features.columns, dtype=str)
+        )
+        return {
+            'file': filename,
+            'symbol': symbol,
+            'rows': int(len(features)),
+            'start': str(timestamps.iloc[0]),
+            'end': str(timestamps.iloc[-1]),
+        }
+
+    def build(self, chunks, symbol='BTCUSDT'):
+        """
+        Turn an iterable of time-ordered bar chunks into .npz shards.
+        Returns the shard entries written for this symbol.
+        """
+        os.makedirs(self.output_dir, exist_ok=True)
+        manifest = self.load_manifest()
+        # Rebuilding a symbol replaces its previous shards
+        manifest['shards'] = [s for s in manifest['shards'] if s['symbol'] != symbol]
+
+        tail = None          # raw bars carried into the next chunk
+        emit_start = 0       # first row of `tail` not yet written
+        written = []
+
+        for chunk in chunks:
+            if chunk is None or len(chunk) == 0:
+                continue
+            chunk = chunk.sort_values('timestamp')
+            if tail is not None and chunk['timestamp'].iloc[0] <= tail['timestamp'].iloc[-1]:
+                raise ValueError(f"Chunks for {symbol} are not time-ordered at {chunk['timestamp'].iloc[0]}")
+
+            raw = chunk if tail is None else pd.concat([tail, chunk])
+            raw = raw.reset_index(drop=True)
+
+            data = self.engineer.create_technical_indicators(raw)
+            data = self.engineer.create_target_variable(data, self.lookahead_periods, self.threshold)
+
+            # Rows whose future close is inside this window
+            emit_end = max(len(raw) - self.lookahead_periods, emit_start)
+            rows = data[(data.index >= emit_start) & (data.index < emit_end)]
+
+            if len(rows):
+                features, target = self.engineer.prepare_features(rows)
+                if manifest['feature_columns'] is None:
+                    manifest['feature_columns'] = list(features.columns)
+                written.append(self._write_shard(features, target, rows['timestamp'], symbol, len(written)))
+
+            tail_start = max(0, len(raw) - (self.warmup_periods + self.lookahead_periods))
+            tail = raw.iloc[tail_start:]
+            emit_start = emit_end - tail_start
+
+        manifest['shards'].extend(written)
+        manifest['lookahead_periods'] = self.lookahead_periods
+        manifest['threshold'] = self.threshold
+        self._save_manifest(manifest)
+
+        total_rows = sum(s['rows'] for s in written)
+        print(f"✅ Wrote {len(written)} shards ({total_rows} rows) for {symbol} to {self.output_dir}")
+        return written
+
+
+def iter_shards(shard_dir='data/processed/shards', symbols=None):
+    """
+    Yield (features, target) DataFrames one shard at a time, in time order per symbol
+    """
+    with open(os.path.join(shard_dir, 'manifest.json'), 'r', encoding='utf-8') as f:
+        manifest = json.load(f)
+
+    for shard in manifest['shards']:
+        if symbols and shard['symbol'] not in symbols:
+            continue
+        with np.load(os.path.join(shard_dir, shard['file'])) as npz:
+            features = pd.DataFrame(npz['X'], columns=list(npz['columns']))
+            target = pd.Series(npz['y'].astype(int), name='target')
+        yield features, target
+
+# Test function
+def test_dataset_builder():
+    import tempfile
+
+    print("🧪 Testing Chunked Dataset Builder...")
+
+    path = 'data/historical/btc_historical_20251107.csv'
+    engineer = FeatureEngineer()
+    full = engineer.create_target_variable(engineer.create_technical_indicators(pd.read_csv(path, parse_dates=['timestamp'])))
+    full_features, full_target = engineer.prepare_features(full)
+
+    with tempfile.TemporaryDirectory() as directory:
+        builder = ChunkedDatasetBuilder(output_dir=directory)
+        builder.build(iter_csv_chunks(path, chunk_size=500), symbol='BTCUSDT')
+
+        shards = list(iter_shards(directory))
+        features = pd.concat([f for f, _ in shards], ignore_index=True)
+        target = pd.concat([t for _, t in shards], ignore_index=True)
+
+    print(f"📊 Chunked rows: {len(features)}, full-frame rows: {len(full_features)}")
+    assert len(features) == len(full_features)
+    assert (target.values == full_target.values).all()
+    assert np.allclose(features.values, full_features.values, rtol=1e-9)
+    print("✅ Shards match the full-frame features")
+
+    return features, target
+
+if __name__ == "__main__":
+    test_dataset_builder()
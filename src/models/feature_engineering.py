@@ -1,5 +1,6 @@
 import pandas as pd
 import numpy as np
+from collections import deque
 from datetime import datetime, timedelta
 
 class FeatureEngineer:
@@ -41,7 +42,56 @@ class FeatureEngineer:
         
         print(f"✅ Created {len([col for col in data.columns if col not in ['timestamp', 'open', 'high', 'low', 'close', 'volume']])} technical indicators")
         return data
-    
+
+    def add_sentiment_features(self, df, sentiment_df, half_life='6h', prefix='sentiment'):
+        """
+        Attach time-decayed sentiment to each price bar (as-of join, no lookahead).
+
+        sentiment_df: scored items with 'timestamp' and 'polarity' (e.g. SentimentStore.load).
+        Each bar only sees items stamped at or before its own timestamp:
+          <prefix>_mean: decayed mean polarity (0 before the first item)
+          <prefix>_weight: decayed item count at the bar time (news intensity)
+          <prefix>_age_hours: hours since the latest item (-1 before the first item)
+        """
+        data = df.copy()
+        lam = np.log(2) / pd.Timedelta(half_life).total_seconds()
+
+        if sentiment_df is None:
+            sentiment_df = pd.DataFrame(columns=['timestamp', 'polarity'])
+        events = pd.DataFrame({
+            'timestamp': pd.to_datetime(sentiment_df['timestamp'], format='ISO8601'),
+            'polarity': pd.to_numeric(sentiment_df['polarity'], errors='coerce')
+        }).dropna().sort_values('timestamp', kind='stable')
+
+        bar_times = pd.to_datetime(data['timestamp']).to_numpy(dtype='datetime64[ns]').astype(np.int64) / 1e9
+        mean = np.zeros(len(data))
+        weight = np.zeros(len(data))
+        age_hours = np.full(len(data), -1.0)
+
+        if len(events):
+            event_times = events['timestamp'].to_numpy(dtype='datetime64[ns]').astype(np.int64) / 1e9
+            # Decayed mean after each item (exact for irregular spacing)
+            event_mean = events['polarity'].ewm(halflife=pd.Timedelta(half_life), times=events['timestamp']).mean().to_numpy()
+            # Decayed count after each item: log w_k = -lam*t_k + log sum_j exp(lam*t_j)
+            relative = event_times - event_times[0]
+            event_log_weight = np.logaddexp.accumulate(lam * relative) - lam * relative
+
+            # As-of join: latest item at or before each bar
+            position = np.searchsorted(event_times, bar_times, side='right') - 1
+            seen = position >= 0
+            latest = position[seen]
+            elapsed = bar_times[seen] - event_times[latest]
+            mean[seen] = event_mean[latest]
+            weight[seen] = np.exp(event_log_weight[latest] - lam * elapsed)
+            age_hours[seen] = elapsed / 3600
+
+        data[f'{prefix}_mean'] = mean
+        data[f'{prefix}_weight'] = weight
+        data[f'{prefix}_age_hours'] = age_hours
+
+        print(f"✅ Added sentiment features from {len(events)} scored items (half-life {half_life})")
+        return data
+
     def create_target_variable(self, df, lookahead_periods=4, threshold=0.01):
         """
         Create target variable for binary classification
@@ -83,6 +133,92 @@ class FeatureEngineer:
         
         return features, target
 
+class StreamingFeatureState:
+    """
+    Incremental version of FeatureEngineer.create_technical_indicators.
+    Keeps only the last 30 bars and produces the indicator row for each
+    newly closed bar, so live code never recomputes the whole frame.
+    """
+    FEATURE_COLUMNS = [
+        'price_change', 'high_low_ratio', 'open_close_ratio', 'ma_5', 'ma_15', 'ma_30',
+        'ma_ratio_5_15', 'ma_ratio_15_30', 'volatility_5', 'volatility_15',
+        'price_vs_ma5', 'price_vs_ma15', 'volume_change', 'volume_ma_5'
+    ]
+    WARMUP_PERIODS = 30
+    
+    def __init__(self):
+        self.closes = deque(maxlen=self.WARMUP_PERIODS)
+        self.volumes = deque(maxlen=5)
+        self.last_timestamp = None
+        self.latest_features = None
+    
+    def update(self, bar):
+        """
+        Add one closed bar (dict or Series with timestamp/open/high/low/close/volume)
+        and return its feature dict. Bars that are not newer than the last one are ignored.
+        """
+        timestamp = pd.Timestamp(bar['timestamp'])
+        if self.last_timestamp is not None and timestamp <= self.last_timestamp:
+            return None
+        
+        close = float(bar['close'])
+        volume = float(bar['volume'])
+        prev_close = self.closes[-1] if self.closes else np.nan
+        prev_volume = self.volumes[-1] if self.volumes else np.nan
+        
+        self.closes.append(close)
+        self.volumes.append(volume)
+        self.last_timestamp = timestamp
+        
+        closes = np.fromiter(self.closes, dtype=float)
+        
+        def window_mean(values, n):
+            return values[-n:].mean() if len(values) >= n else np.nan
+        
+        def window_std(values, n):
+            return values[-n:].std(ddof=1) if len(values) >= n else np.nan
+        
+        ma_5 = window_mean(closes, 5)
+        ma_15 = window_mean(closes, 15)
+        ma_30 = window_mean(closes, 30)
+        
+        with np.errstate(divide='ignore', invalid='ignore'):
+            features = {
+                'price_change': close / prev_close - 1,
+                'high_low_ratio': float(bar['high']) / float(bar['low']),
+                'open_close_ratio': float(bar['open']) / close,
+                'ma_5': ma_5,
+                'ma_15': ma_15,
+                'ma_30': ma_30,
+                'ma_ratio_5_15': ma_5 / ma_15,
+                'ma_ratio_15_30': ma_15 / ma_30,
+                'volatility_5': window_std(closes, 5),
+                'volatility_15': window_std(closes, 15),
+                'price_vs_ma5': close / ma_5,
+                'price_vs_ma15': close / ma_15,
+                'volume_change': volume / prev_volume - 1,
+                'volume_ma_5': window_mean(np.fromiter(self.volumes, dtype=float), 5),
+            }
+        
+        self.latest_features = features
+        return features
+    
+    def update_many(self, df):
+        """Feed a DataFrame of bars in time order, returning the last feature dict"""
+        for bar in df.to_dict('records'):
+            self.update(bar)
+        return self.latest_features
+    
+    def is_warm(self):
+        """True once every indicator has enough history"""
+        return len(self.closes) >= self.WARMUP_PERIODS
+    
+    def to_frame(self):
+        """Latest features as a one-row DataFrame, like prepare_live_features"""
+        if self.latest_features is None:
+            return None
+        return pd.DataFrame([self.latest_features], columns=self.FEATURE_COLUMNS)
+
 # Test function
 def test_feature_engineering():
     # Load sample data (from Phase 1)
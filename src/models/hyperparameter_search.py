@@ -0,0 +1,315 @@
+import json
+import math
+import os
+import time
+
+import numpy as np
+from joblib import Parallel, delayed
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.linear_model import LogisticRegression
+from sklearn.metrics import accuracy_score
+from sklearn.model_selection import train_test_split
+
+from .model_artifact import data_fingerprint
+
+# Search checkpoints live apart from the model artifacts the registry scans
+DEFAULT_SEARCH_DIR = 'data/cache/search'
+
+# Search spaces: each value is a list of choices (sampled uniformly) or any
+# object with an ``rvs`` method (e.g. scipy.stats distributions)
+DEFAULT_SEARCH_SPACES = {
+    'random_forest': {
+        'max_depth': [4, 6, 8, 10, 14, None],
+        'min_samples_leaf': [1, 2, 5, 10],
+        'max_features': ['sqrt', 'log2', 0.5],
+        'class_weight': [None, 'balanced'],
+    },
+    'logistic_regression': {
+        'C': [0.001, 0.01, 0.1, 1.0, 10.0, 100.0],
+        'class_weight': [None, 'balanced'],
+    },
+}
+
+# Budget resource per model: random forests grow more trees,
+# logistic regression sees a larger fraction of the training rows
+DEFAULT_BUDGETS = {
+    'random_forest': {'resource': 'n_estimators', 'min_budget': 10, 'max_budget': 200},
+    'logistic_regression': {'resource': 'sample_fraction', 'min_budget': 1 / 9, 'max_budget': 1.0},
+}
+
+
+def build_model(model_name, params, budget=None, random_state=42):
+    """
+    Build an untrained model for the given hyperparameters and budget
+    """
+    params = dict(params or {})
+    if model_name == 'random_forest':
+        if budget is not None:
+            params['n_estimators'] = int(round(budget))
+        params.setdefault('n_estimators', 100)
+        return RandomForestClassifier(random_state=random_state, n_jobs=1, **params)
+    if model_name == 'logistic_regression':
+        params.setdefault('max_iter', 1000)
+        return LogisticRegression(random_state=random_state, **params)
+    raise ValueError(f"Unknown model: {model_name}")
+
+
+def _evaluate_trial(model_name, params, budget, resource, X_train, y_train, X_val, y_val, random_state):
+    """Train one config at one budget and score it on the validation split"""
+    start = time.time()
+
+    if resource == 'sample_fraction' and budget < 1.0:
+        n_rows = max(int(len(X_train) * budget), 2)
+        rng = np.random.RandomState(random_state)
+        rows = np.sort(rng.choice(len(X_train), size=n_rows, replace=False))
+        X_fit, y_fit = X_train.iloc[rows], y_train.iloc[rows]
+        model = build_model(model_name, params, random_state=random_state)
+    else:
+        X_fit, y_fit = X_train, y_train
+        model = build_model(model_name, params, budget=budget, random_state=random_state)
+
+    try:
+        model.fit(X_fit, y_fit)
+        score = accuracy_score(y_val, model.predict(X_val))
+    except Exception as e:
+        # A single bad config should not abort the whole search
+        print(f"⚠️  Trial failed for {params}: {e}")
+        score = float('-inf')
+
+    return {
+        'params': params,
+        'budget': budget,
+        'score': score,
+        'duration_seconds': time.time() - start,
+    }
+
+
+class HyperparameterSearch:
+    """
+    Successive halving / Hyperband search over a configurable space.
+
+    Every rung trains all surviving configs at the current budget (in
+    parallel), keeps the best ``1/eta`` of them and multiplies the budget
+    by ``eta``. Finished trials are checkpointed to JSON, so re-running the
+    same search after an interruption skips everything already scored.
+    The checkpoint records the data fingerprint, search space and budget
+    settings; it is only reused when all of them match.
+    """
+
+    def __init__(self, model_name='random_forest', search_space=None, strategy='hyperband',
+                 eta=3, min_budget=None, max_budget=None, n_configs=None, n_jobs=-1,
+                 validation_size=0.2, checkpoint_path=None, random_state=42):
+        if model_name not in DEFAULT_BUDGETS:
+            raise ValueError(f"Unknown model: {model_name}")
+        if strategy not in ('hyperband', 'successive_halving'):
+            raise ValueError(f"Unknown strategy: {strategy}")
+
+        budgets = DEFAULT_BUDGETS[model_name]
+        self.model_name = model_name
+        self.search_space = search_space or DEFAULT_SEARCH_SPACES[model_name]
+        self.strategy = strategy
+        self.eta = eta
+        self.resource = budgets['resource']
+        self.min_budget = min_budget if min_budget is not None else budgets['min_budget']
+        self.max_budget = max_budget if max_budget is not None else budgets['max_budget']
+        self.n_configs = n_configs
+        self.n_jobs = n_jobs
+        self.validation_size = validation_size
+        self.checkpoint_path = checkpoint_path
+        self.random_state = random_state
+
+        self.results = []
+        self._completed = {}
+        self._header = None
+        self.best_params = None
+        self.best_score = None
+
+    def sample_configs(self, n, rng):
+        """Draw ``n`` configs from the search space"""
+        configs = []
+        for _ in range(n):
+            config = {}
+            for name, space in self.search_space.items():
+                if hasattr(space, 'rvs'):
+                    value = space.rvs(random_state=rng)
+                    config[name] = value.item() if hasattr(value, 'item') else value
+                else:
+                    config[name] = space[rng.randint(len(space))]
+            configs.append(config)
+        return configs
+
+    def _trial_key(self, params, budget):
+        return json.dumps({'params': params, 'budget': round(float(budget), 6)}, sort_keys=True, default=str)
+
+    def _describe_space(self):
+        """JSON-able description of the search space (distributions by name and arguments)"""
+        described = {}
+        for name, space in self.search_space.items():
+            if hasattr(space, 'rvs'):
+                dist = getattr(space, 'dist', None)
+                described[name] = {'distribution': getattr(dist, 'name', type(space).__name__),
+                                   'args': list(getattr(space, 'args', ())), 'kwds': getattr(space, 'kwds', {})}
+            else:
+                described[name] = list(space)
+        return json.loads(json.dumps(described, sort_keys=True, default=str))
+
+    def checkpoint_header(self, X_train, y_train):
+        """Everything a checkpointed trial depends on besides its params and budget"""
+        return json.loads(json.dumps({
+            'model_name': self.model_name,
+            'data_fingerprint': data_fingerprint(X_train, y_train),
+            'search_space': self._describe_space(),
+            'strategy': self.strategy,
+            'eta': self.eta,
+            'min_budget': self.min_budget,
+            'max_budget': self.max_budget,
+            'n_configs': self.n_configs,
+            'validation_size': self.validation_size,
+            'random_state': self.random_state,
+        }, sort_keys=True, default=str))
+
+    def _load_checkpoint(self):
+        """Load finished trials from a previous (possibly interrupted) run of the same search"""
+        self._completed = {}
+        if not os.path.exists(self.checkpoint_path):
+            return
+        try:
+            with open(self.checkpoint_path, 'r', encoding='utf-8') as f:
+                state = json.load(f)
+            if state.get('header') != self._header:
+                print("⚠️  Checkpoint was written for other data or search settings, ignoring it")
+                return
+            for trial in state.get('trials', []):
+                self._completed[self._trial_key(trial['params'], trial['budget'])] = trial
+            print(f"♻️  Resuming search with {len(self._completed)} finished trials")
+        except Exception as e:
+            print(f"❌ Error loading search checkpoint: {e}")
+
+    def _save_checkpoint(self):
+        if not self.checkpoint_path:
+            return
+        directory = os.path.dirname(self.checkpoint_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        state = {
+            'header': self._header,
+            'trials': list(self._completed.values()),
+        }
+        # Write then rename, so a crash mid-write never corrupts the checkpoint
+        tmp_path = self.checkpoint_path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(state, f, indent=2, default=str)
+        os.replace(tmp_path, self.checkpoint_path)
+
+    def _run_rung(self, configs, budget, data):
+        """Score every config at ``budget``, reusing checkpointed trials"""
+        todo = [c for c in configs if self._trial_key(c, budget) not in self._completed]
+
+        if todo:
+            new_trials = Parallel(n_jobs=self.n_jobs)(
+                delayed(_evaluate_trial)(self.model_name, config, budget, self.resource,
+                                         *data, self.random_state)
+                for config in todo
+            )
+            for trial in new_trials:
+                self._completed[self._trial_key(trial['params'], trial['budget'])] = trial
+            self._save_checkpoint()
+
+        return [self._completed[self._trial_key(c, budget)] for c in configs]
+
+    def _successive_halving(self, configs, min_budget, data):
+        """Run one bracket, returning the trials of its final rung"""
+        budget = min_budget
+        trials = []
+
+        while configs:
+            trials = self._run_rung(configs, budget, data)
+            self.results.extend(trials)
+            print(f"   🔎 Budget {budget:g}: {len(configs)} configs, best score {max(t['score'] for t in trials):.3f}")
+
+            if budget >= self.max_budget or len(configs) == 1:
+                break
+
+            n_keep = max(len(configs) // self.eta, 1)
+            ranked = sorted(trials, key=lambda t: t['score'], reverse=True)
+            configs = [t['params'] for t in ranked[:n_keep]]
+            budget = min(budget * self.eta, self.max_budget)
+
+        return trials
+
+    def fit(self, X_train, y_train):
+        """
+        Run the search on training data and return the best params found
+        """
+        print(f"🎛️  Tuning {self.model_name} with {self.strategy} (eta={self.eta})...")
+        start = time.time()
+
+        self._header = self.checkpoint_header(X_train, y_train)
+        if self.checkpoint_path:
+            self._load_checkpoint()
+
+        # Hold out part of the training data so the test set stays untouched
+        X_fit, X_val, y_fit, y_val = train_test_split(
+            X_train, y_train, test_size=self.validation_size,
+            random_state=self.random_state, stratify=y_train
+        )
+        data = (X_fit, y_fit, X_val, y_val)
+        rng = np.random.RandomState(self.random_state)
+        self.results = []
+
+        s_max = int(math.floor(math.log(self.max_budget / self.min_budget, self.eta) + 1e-9))
+        if self.strategy == 'successive_halving':
+            brackets = [s_max]
+        else:
+            brackets = list(range(s_max, -1, -1))
+
+        final_trials = []
+        for s in brackets:
+            if self.n_configs and self.strategy == 'successive_halving':
+                n = self.n_configs
+            else:
+                n = int(math.ceil((s_max + 1) / (s + 1) * self.eta ** s))
+            bracket_min_budget = self.max_budget * self.eta ** (-s)
+            configs = self.sample_configs(n, rng)
+            final_trials.extend(self._successive_halving(configs, bracket_min_budget, data))
+
+        # Prefer configs that survived to the largest budget
+        best = max(final_trials, key=lambda t: (t['budget'], t['score']))
+        self.best_params = best['params']
+        self.best_score = best['score']
+
+        trials_run = len(self.results)
+        full_grid = int(np.prod([len(v) for v in self.search_space.values() if not hasattr(v, 'rvs')]))
+        print(f"✅ Search finished in {time.time() - start:.1f}s ({trials_run} trials, full grid: {full_grid} configs at max budget)")
+        print(f"🏆 Best params: {self.best_params} (validation accuracy {self.best_score:.3f})")
+
+        return self.best_params
+
+    def get_results(self):
+        """Return all trials as a DataFrame, best first"""
+        import pandas as pd
+
+        if not self.results:
+            return pd.DataFrame(columns=['params', 'budget', 'score', 'duration_seconds'])
+        return pd.DataFrame(self.results).sort_values(['budget', 'score'], ascending=False)
+
+# Test function
+def test_hyperparameter_search():
+    import pandas as pd
+
+    print("🧪 Testing Hyperparameter Search...")
+
+    rng = np.random.RandomState(0)
+    X = pd.DataFrame(rng.normal(size=(600, 5)), columns=[f'f{i}' for i in range(5)])
+    y = pd.Series((X['f0'] + 0.5 * X['f1'] + rng.normal(scale=0.5, size=600) > 0).astype(int))
+
+    search = HyperparameterSearch('random_forest', strategy='successive_halving',
+                                  n_configs=9, max_budget=90, n_jobs=2)
+    best_params = search.fit(X, y)
+    print(f"📊 Trials run: {len(search.get_results())}")
+
+    return best_params
+
+if __name__ == "__main__":
+    test_hyperparameter_search()
@@ -0,0 +1,175 @@
+import hashlib
+import json
+import os
+from datetime import datetime
+
+import joblib
+import numpy as np
+import pandas as pd
+
+ARTIFACT_FORMAT_VERSION = 2
+
+
+def header_path_for(model_path):
+    """Path of the JSON header that sits next to a model payload"""
+    return os.path.splitext(model_path)[0] + '.json'
+
+
+def data_fingerprint(features, target=None):
+    """
+    Cheap, stable fingerprint of the training data (shape, columns and row hashes)
+    """
+    hasher = hashlib.sha256()
+    hasher.update(json.dumps(list(map(str, features.columns))).encode('utf-8'))
+    hasher.update(pd.util.hash_pandas_object(features, index=False).values.tobytes())
+    if target is not None:
+        hasher.update(pd.util.hash_pandas_object(target, index=False).values.tobytes())
+
+    fingerprint = {
+        'sha256': hasher.hexdigest(),
+        'n_rows': int(len(features)),
+        'n_features': int(features.shape[1]),
+    }
+    if target is not None:
+        fingerprint['target_distribution'] = {str(k): int(v) for k, v in target.value_counts().items()}
+    return fingerprint
+
+
+def _atomic_write_json(path, payload):
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(payload, f, indent=2, default=str)
+    os.replace(tmp_path, path)
+
+
+def save_artifact(model, model_path, feature_columns, metrics=None, fingerprint=None, model_name=None, extra=None):
+    """
+    Save a model payload plus a JSON header with its feature schema.
+
+    The payload is written uncompressed so numpy arrays inside the model
+    can be memory-mapped on load. It embeds its own copy of the header,
+    which load_artifact trusts, so a reader that opens a new payload next
+    to the previous JSON header still gets a matching schema. The JSON
+    header is only for listing models without unpickling them. Both files
+    are written to a temp name and renamed into place.
+    """
+    directory = os.path.dirname(model_path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+
+    classes = getattr(model, 'classes_', None)
+    header = {
+        'format_version': ARTIFACT_FORMAT_VERSION,
+        'model_name': model_name or os.path.splitext(os.path.basename(model_path))[0],
+        'model_class': type(model).__name__,
+        'payload_file': os.path.basename(model_path),
+        'feature_columns': list(feature_columns),
+        'classes': [c.item() if hasattr(c, 'item') else c for c in classes] if classes is not None else None,
+        'metrics': {k: float(v) for k, v in (metrics or {}).items()},
+        'data_fingerprint': fingerprint,
+        'created_at': datetime.now().isoformat(),
+    }
+    try:
+        import sklearn
+        header['sklearn_version'] = sklearn.__version__
+    except ImportError:
+        pass
+    if extra:
+        header.update(extra)
+    header = json.loads(json.dumps(header, default=str))
+
+    tmp_path = model_path + '.tmp'
+    joblib.dump({'artifact_header': header, 'model': model}, tmp_path, compress=0)
+    os.replace(tmp_path, model_path)
+
+    header = dict(header, payload_bytes=os.path.getsize(model_path), payload_mtime=os.path.getmtime(model_path))
+    _atomic_write_json(header_path_for(model_path), header)
+    return header
+
+
+def read_artifact_header(model_path):
+    """
+    Read only the JSON header of an artifact (no unpickling).
+    Returns None for legacy pickles saved without a header.
+    """
+    path = header_path_for(model_path)
+    if not os.path.exists(path):
+        return None
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except Exception as e:
+        print(f"❌ Error reading model header {path}: {e}")
+        return None
+
+
+def load_artifact(model_path, mmap=True):
+    """
+    Load a model and its header. Large arrays are memory-mapped when
+    ``mmap`` is True instead of being copied into memory.
+    """
+    payload = joblib.load(model_path, mmap_mode='r' if mmap else None)
+    if isinstance(payload, dict) and 'artifact_header' in payload:
+        # The embedded header always belongs to this payload
+        return payload['model'], payload['artifact_header']
+
+    # Format 1 and legacy pickles hold the bare model
+    model = payload
+    header = read_artifact_header(model_path)
+    if header is None:
+        # Legacy pickle: recover what schema we can from the model itself
+        feature_names = getattr(model, 'feature_names_in_', None)
+        header = {
+            'format_version': 0,
+            'model_name': os.path.splitext(os.path.basename(model_path))[0],
+            'model_class': type(model).__name__,
+            'feature_columns': [str(c) for c in feature_names] if feature_names is not None else None,
+            'metrics': {},
+            'data_fingerprint': None,
+        }
+    elif header.get('format_version', 0) > ARTIFACT_FORMAT_VERSION:
+        print(f"⚠️  {model_path} uses artifact format {header['format_version']}, newer than supported {ARTIFACT_FORMAT_VERSION}")
+
+    return model, header
+
+
+def list_artifacts(directory='src/models/saved_models'):
+    """Headers of all models in a directory, read without loading any model"""
+    headers = []
+    if not os.path.isdir(directory):
+        return headers
+    for filename in sorted(os.listdir(directory)):
+        if filename.endswith('.pkl'):
+            model_path = os.path.join(directory, filename)
+            header = read_artifact_header(model_path) or {'model_name': filename[:-4], 'format_version': 0}
+            header['path'] = model_path
+            headers.append(header)
+    return headers
+
+# Test function
+def test_model_artifact():
+    import tempfile
+    from sklearn.ensemble import RandomForestClassifier
+
+    print("🧪 Testing Model Artifact Format...")
+
+    rng = np.random.RandomState(0)
+    X = pd.DataFrame(rng.normal(size=(200, 3)), columns=['a', 'b', 'c'])
+    y = pd.Series((X['a'] > 0).astype(int))
+    model = RandomForestClassifier(n_estimators=10, random_state=42).fit(X, y)
+
+    with tempfile.TemporaryDirectory() as directory:
+        model_path = os.path.join(directory, 'random_forest.pkl')
+        save_artifact(model, model_path, X.columns, metrics={'accuracy': 0.9}, fingerprint=data_fingerprint(X, y))
+
+        header = read_artifact_header(model_path)
+        print(f"📄 Header: {header['model_class']} with features {header['feature_columns']}")
+
+        loaded, _ = load_artifact(model_path)
+        assert (loaded.predict(X) == model.predict(X)).all()
+        print("✅ Loaded model matches original predictions")
+
+    return header
+
+if __name__ == "__main__":
+    test_model_artifact()
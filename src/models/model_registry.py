@@ -0,0 +1,203 @@
+import os
+import threading
+from collections import OrderedDict
+
+from .model_artifact import list_artifacts, read_artifact_header, save_artifact
+from .predict import PricePredictor
+
+
+def artifact_filename(model_name, symbol=None, interval=None, version=None):
+    """File name for a (possibly symbol/interval specific) model version"""
+    parts = [model_name]
+    if symbol:
+        parts.append(symbol.upper())
+    if interval:
+        parts.append(interval)
+    if version is not None:
+        parts.append(f'v{version}')
+    return '_'.join(parts) + '.pkl'
+
+
+class ModelRegistry:
+    """
+    Resolves (model, symbol, interval, version) to an artifact in
+    ``directory`` and keeps a bounded LRU of loaded predictors.
+
+    The index is built from artifact headers only, and is rebuilt when
+    the directory changes. A loaded model is reloaded when its file's
+    mtime changes; the new predictor is loaded first and swapped in
+    under the lock, so callers always get a complete model.
+    """
+
+    def __init__(self, directory='src/models/saved_models', max_models=8):
+        self.directory = directory
+        self.max_models = max_models
+        self._lock = threading.RLock()
+        self._loaded = OrderedDict()   # path -> (mtime, predictor)
+        self._index = {}               # (model_name, symbol, interval) -> {version: path}
+        self._directory_mtime = None
+        self.stats = {'hits': 0, 'loads': 0, 'reloads': 0, 'evictions': 0}
+
+    def _directory_changed(self):
+        try:
+            return os.path.getmtime(self.directory) != self._directory_mtime
+        except OSError:
+            return False
+
+    def refresh_index(self, force=False):
+        """Rebuild the (model, symbol, interval) -> versions index from headers"""
+        with self._lock:
+            if not force and self._directory_mtime is not None and not self._directory_changed():
+                return self._index
+
+            index = {}
+            for header in list_artifacts(self.directory):
+                key = (header.get('model_name'), header.get('symbol'), header.get('interval'))
+                index.setdefault(key, {})[int(header.get('version') or 0)] = header['path']
+
+            self._index = index
+            if os.path.isdir(self.directory):
+                self._directory_mtime = os.path.getmtime(self.directory)
+            return self._index
+
+    def resolve(self, model_name='random_forest', symbol=None, interval=None, version=None):
+        """
+        Path of the best matching artifact. Falls back from the exact
+        (symbol, interval) model to symbol-only, interval-only and
+        finally the generic model; ``version=None`` means latest.
+        """
+        index = self.refresh_index()
+        symbol = symbol.upper() if symbol else None
+
+        for key in [(model_name, symbol, interval), (model_name, symbol, None),
+                    (model_name, None, interval), (model_name, None, None)]:
+            versions = index.get(key)
+            if not versions:
+                continue
+            if version is None:
+                return versions[max(versions)]
+            if version in versions:
+                return versions[version]
+        return None
+
+    def get(self, model_name='random_forest', symbol=None, interval=None, version=None):
+        """Loaded PricePredictor for the resolved artifact (or None)"""
+        path = self.resolve(model_name, symbol, interval, version)
+        if path is None:
+            print(f"❌ No model found for {model_name} {symbol or ''} {interval or ''}")
+            return None
+
+        try:
+            mtime = os.path.getmtime(path)
+        except OSError:
+            # File vanished after indexing
+            self.refresh_index(force=True)
+            return None
+
+        with self._lock:
+            entry = self._loaded.get(path)
+            if entry is not None and entry[0] == mtime:
+                self._loaded.move_to_end(path)
+                self.stats['hits'] += 1
+                return entry[1]
+
+        # Load outside the lock so other sessions keep being served
+        predictor = PricePredictor(path)
+        if predictor.model is None:
+            return entry[1] if entry is not None else None
+
+        with self._lock:
+            self.stats['reloads' if entry is not None else 'loads'] += 1
+            self._loaded[path] = (mtime, predictor)
+            self._loaded.move_to_end(path)
+            while len(self._loaded) > self.max_models:
+                self._loaded.popitem(last=False)
+                self.stats['evictions'] += 1
+        return predictor
+
+    def publish(self, model, model_name, feature_columns, symbol=None, interval=None,
+                metrics=None, fingerprint=None, extra=None):
+        """Save a new version of a model; readers pick it up on their next get()"""
+        with self._lock:
+            self.refresh_index(force=True)
+            symbol = symbol.upper() if symbol else None
+            versions = self._index.get((model_name, symbol, interval), {})
+            version = max(versions) + 1 if versions else 1
+
+            path = os.path.join(self.directory, artifact_filename(model_name, symbol, interval, version))
+            header_extra = {'symbol': symbol, 'interval': interval, 'version': version}
+            header_extra.update(extra or {})
+            save_artifact(model, path, feature_columns, metrics=metrics, fingerprint=fingerprint,
+                          model_name=model_name, extra=header_extra)
+            self.refresh_index(force=True)
+
+        print(f"📦 Published {model_name} v{version} for {symbol or 'all symbols'} {interval or ''}")
+        return path
+
+    def describe(self):
+        """Headers of all indexed models, read without loading them"""
+        self.refresh_index()
+        rows = []
+        for (model_name, symbol, interval), versions in sorted(self._index.items(), key=str):
+            for version, path in sorted(versions.items()):
+                header = read_artifact_header(path) or {}
+                rows.append({
+                    'model_name': model_name,
+                    'symbol': symbol,
+                    'interval': interval,
+                    'version': version,
+                    'path': path,
+                    'loaded': path in self._loaded,
+                    'metrics': header.get('metrics', {}),
+                })
+        return rows
+
+
+_shared_registry = None
+_shared_lock = threading.Lock()
+
+
+def get_registry(directory='src/models/saved_models', max_models=8):
+    """Process-wide registry shared by every dashboard session"""
+    global _shared_registry
+    with _shared_lock:
+        if _shared_registry is None:
+            _shared_registry = ModelRegistry(directory, max_models)
+        return _shared_registry
+
+# Test function
+def test_model_registry():
+    import tempfile
+    import time
+    import numpy as np
+    import pandas as pd
+    from sklearn.linear_model import LogisticRegression
+
+    print("🧪 Testing Model Registry...")
+
+    rng = np.random.RandomState(0)
+    X = pd.DataFrame(rng.normal(size=(200, 3)), columns=['a', 'b', 'c'])
+    y = (X['a'] > 0).astype(int)
+
+    with tempfile.TemporaryDirectory() as directory:
+        registry = ModelRegistry(directory, max_models=2)
+        registry.publish(LogisticRegression().fit(X, y), 'logistic_regression', X.columns)
+        registry.publish(LogisticRegression().fit(X, y), 'logistic_regression', X.columns, symbol='ETHUSDT', interval='1h')
+
+        generic = registry.get('logistic_regression', 'BTCUSDT', '1h')
+        specific = registry.get('logistic_regression', 'ETHUSDT', '1h')
+        assert generic is not specific
+        assert registry.get('logistic_regression', 'BTCUSDT', '1h') is generic
+
+        time.sleep(0.01)
+        registry.publish(LogisticRegression(C=0.1).fit(X, y), 'logistic_regression', X.columns, symbol='ETHUSDT', interval='1h')
+        assert registry.get('logistic_regression', 'ETHUSDT', '1h') is not specific
+
+        print(f"📊 Registry stats: {registry.stats}")
+        for row in registry.describe():
+            print(f"  - {row['model_name']} {row['symbol']} {row['interval']} v{row['version']}")
+
+    return registry
+
+if __name__ == "__main__":
+    test_model_registry()
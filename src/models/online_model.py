@@ -0,0 +1,176 @@
+import os
+from collections import deque
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+from sklearn.linear_model import SGDClassifier
+from sklearn.pipeline import Pipeline
+from sklearn.preprocessing import StandardScaler
+
+from .feature_engineering import StreamingFeatureState
+from .model_artifact import save_artifact
+
+
+class OnlinePricePredictor:
+    """
+    Logistic model (SGD) that learns from every closed bar.
+
+    Each bar's features wait in a queue until ``lookahead_periods`` more
+    bars have closed; then the target is known (same rule as
+    FeatureEngineer.create_target_variable) and the model takes one
+    ``partial_fit`` step. Snapshots are saved as regular model artifacts,
+    so PricePredictor can load them like any batch-trained model.
+    """
+
+    def __init__(self, lookahead_periods=4, threshold=0.01, feature_state=None,
+                 snapshot_every=100, snapshot_dir='src/models/saved_models',
+                 model_name='online_sgd', alpha=0.0001, random_state=42):
+        self.lookahead_periods = lookahead_periods
+        self.threshold = threshold
+        self.feature_state = feature_state or StreamingFeatureState()
+        self.feature_columns = list(StreamingFeatureState.FEATURE_COLUMNS)
+        self.snapshot_every = snapshot_every
+        self.snapshot_dir = snapshot_dir
+        self.model_name = model_name
+
+        self.model = Pipeline([
+            ('scaler', StandardScaler()),
+            ('sgd', SGDClassifier(loss='log_loss', alpha=alpha, random_state=random_state)),
+        ])
+        self.classes = np.array([0, 1])
+
+        # (close, features) of bars whose label has not resolved yet
+        self.pending = deque()
+        self.samples_seen = 0
+        self.correct_predictions = 0
+        self.label_counts = {0: 0, 1: 0}
+        self.last_snapshot_path = None
+
+        print("✅ Online Price Predictor Initialized")
+
+    @property
+    def is_fitted(self):
+        return self.samples_seen > 0
+
+    def learn_one(self, features, target):
+        """One partial_fit step on a single labelled row"""
+        X = pd.DataFrame([features], columns=self.feature_columns)
+        scaler, sgd = self.model.named_steps['scaler'], self.model.named_steps['sgd']
+
+        # Progressive validation: score the row before learning from it
+        if self.is_fitted:
+            self.correct_predictions += int(self.model.predict(X)[0] == target)
+
+        scaler.partial_fit(X)
+        sgd.partial_fit(scaler.transform(X), [target], classes=self.classes)
+
+        self.samples_seen += 1
+        self.label_counts[target] += 1
+
+        if self.snapshot_every and self.samples_seen % self.snapshot_every == 0:
+            self.save_snapshot()
+
+    def update(self, bar):
+        """
+        Feed one closed bar: resolve delayed labels, learn from them,
+        then return a prediction for the new bar (or None while cold)
+        """
+        features = self.feature_state.update(bar)
+        if features is None:
+            return None
+
+        close = float(bar['close'])
+        self.pending.append((close, features))
+
+        # The oldest pending bar is labelled once its horizon has closed
+        while len(self.pending) > self.lookahead_periods:
+            past_close, past_features = self.pending.popleft()
+            future_return = (close - past_close) / past_close
+            target = int(future_return > self.threshold)
+
+            # create_target_variable drops rows with missing indicators
+            if not any(pd.isna(v) for v in past_features.values()):
+                self.learn_one(past_features, target)
+
+        return self.predict_latest()
+
+    def update_many(self, df):
+        """Replay a DataFrame of bars (e.g. recent history) through the model"""
+        result = None
+        for bar in df.to_dict('records'):
+            result = self.update(bar)
+        return result
+
+    def predict_latest(self):
+        """Predict for the most recent bar, in PricePredictor's result format"""
+        if not self.is_fitted or self.label_counts[0] == 0 or self.label_counts[1] == 0:
+            return None
+
+        features = self.feature_state.to_frame().fillna(0)
+        prediction_proba = self.model.predict_proba(features)[0]
+        prediction = int(np.argmax(prediction_proba))
+
+        return {
+            'prediction': prediction,
+            'movement': "UP 📈" if prediction == 1 else "DOWN 📉",
+            'confidence': round(prediction_proba[prediction], 3),
+            'probability_up': round(prediction_proba[1], 3),
+            'probability_down': round(prediction_proba[0], 3),
+            'timestamp': datetime.now()
+        }
+
+    def get_stats(self):
+        """Samples learned and progressive (predict-then-learn) accuracy"""
+        scored = max(self.samples_seen - 1, 0)
+        return {
+            'samples_seen': self.samples_seen,
+            'pending_labels': len(self.pending),
+            'label_counts': dict(self.label_counts),
+            'progressive_accuracy': round(self.correct_predictions / scored, 3) if scored else None,
+        }
+
+    def save_snapshot(self, path=None):
+        """Publish the current model as an artifact"""
+        path = path or os.path.join(self.snapshot_dir, f'{self.model_name}.pkl')
+        stats = self.get_stats()
+        try:
+            save_artifact(
+                self.model, path,
+                feature_columns=self.feature_columns,
+                metrics={'progressive_accuracy': stats['progressive_accuracy'] or 0.0},
+                model_name=self.model_name,
+                extra={
+                    'online': True,
+                    'samples_seen': self.samples_seen,
+                    'last_bar_timestamp': self.feature_state.last_timestamp,
+                    'lookahead_periods': self.lookahead_periods,
+                    'threshold': self.threshold,
+                }
+            )
+            self.last_snapshot_path = path
+            print(f"💾 Online model snapshot saved to {path} ({self.samples_seen} samples)")
+        except Exception as e:
+            print(f"❌ Error saving online model snapshot: {e}")
+        return path
+
+# Test function
+def test_online_model():
+    import tempfile
+
+    print("🧪 Testing Online Model...")
+
+    data = pd.read_csv('data/historical/btc_historical_20251107.csv', parse_dates=['timestamp'])
+
+    with tempfile.TemporaryDirectory() as directory:
+        predictor = OnlinePricePredictor(snapshot_every=500, snapshot_dir=directory)
+        result = predictor.update_many(data)
+
+        print(f"📊 Stats: {predictor.get_stats()}")
+        if result:
+            print(f"🎯 Latest prediction: {result['movement']} ({result['confidence']})")
+
+    return predictor
+
+if __name__ == "__main__":
+    test_online_model()
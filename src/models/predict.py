@@ -1,12 +1,38 @@
-import joblib
+import os
 import pandas as pd
 import numpy as np
 from datetime import datetime
 
+from .model_artifact import load_artifact
+from .tree_inference import compile_model
+
+# Above this many rows sklearn's own predict_proba is faster than FlatForest
+FLAT_ENGINE_MAX_ROWS = 512
+
+def drop_open_bar(historical_data, now=None):
+    """
+    Drop the last kline if it is still open. Klines carry only their open
+    time (naive UTC), so a bar counts as open until one bar spacing
+    (the median gap between timestamps) has passed.
+    """
+    if len(historical_data) < 2:
+        return historical_data
+    timestamps = pd.to_datetime(historical_data['timestamp'])
+    spacing = timestamps.diff().median()
+    if now is None:
+        now = pd.Timestamp.now(tz='UTC')
+        now = now if timestamps.dt.tz is not None else now.tz_localize(None)
+    if timestamps.iloc[-1] + spacing > pd.Timestamp(now):
+        return historical_data.iloc[:-1]
+    return historical_data
+
 class PricePredictor:
     def __init__(self, model_path=None):
         self.model = None
         self.feature_columns = None
+        self.model_info = None
+        self.engine = None
+        self.loaded_mtime = None
         
         if model_path:
             self.load_model(model_path)
@@ -16,7 +42,12 @@ class PricePredictor:
         Load trained model from file
         """
         try:
-            self.model = joblib.load(model_path)
+            # Memory-mapped load; the header carries the training feature schema
+            self.model, self.model_info = load_artifact(model_path)
+            self.loaded_mtime = os.path.getmtime(model_path)
+            self.feature_columns = self.model_info.get('feature_columns')
+            # Forests are flattened once for fast single-row scoring
+            self.engine = compile_model(self.model)
             print(f"✅ Model loaded from {model_path}")
         except Exception as e:
             print(f"❌ Error loading model: {e}")
@@ -37,25 +68,56 @@ class PricePredictor:
         
         features = latest_data[feature_columns]
         
+        # Align to the schema the model was trained on (order and missing columns)
+        if self.feature_columns:
+            features = features.reindex(columns=self.feature_columns)
+            feature_columns = list(self.feature_columns)
+        
         # Handle NaN values
         features = features.fillna(0)
         
         return features, feature_columns
     
-    def predict_price_movement(self, historical_data, feature_engineer):
+    def predict_proba(self, features):
         """
-        Predict whether price will increase in next period
+        Class probabilities from one ensemble pass (flattened engine when available)
+        """
+        # The flat engine wins on small batches; sklearn's compiled traversal on large ones
+        if self.engine is not None and len(features) <= FLAT_ENGINE_MAX_ROWS:
+            return self.engine.predict_proba(features.to_numpy())
+        return self.model.predict_proba(features)
+    
+    @property
+    def model_version(self):
+        """Identifies the loaded model, so cached predictions expire on reload"""
+        info = self.model_info or {}
+        stamp = info.get('created_at') or self.loaded_mtime
+        return f"{info.get('model_name')}:v{info.get('version', 0)}:{stamp}"
+    
+    def predict_price_movement(self, historical_data, feature_engineer, symbol=None, cache=None):
+        """
+        Predict whether price will increase in next period.
+        With a PredictionCache and symbol, the prediction is made from closed bars
+        only and reused until the next bar closes.
         """
         if self.model is None:
             return {"error": "No model loaded"}
         
+        if cache is not None and symbol is not None and len(historical_data):
+            closed_bars = drop_open_bar(historical_data)
+            last_bar = closed_bars['timestamp'].iloc[-1]
+            return cache.get_or_compute(
+                self.model_version, symbol, last_bar,
+                lambda: self.predict_price_movement(closed_bars, feature_engineer)
+            )
+        
         try:
             # Prepare features
             features, feature_columns = self.prepare_live_features(historical_data, feature_engineer)
             
-            # Make prediction
-            prediction = self.model.predict(features)[0]
-            prediction_proba = self.model.predict_proba(features)[0]
+            # Make prediction (predict is the argmax of predict_proba, so score once)
+            prediction_proba = self.predict_proba(features)[0]
+            prediction = self.model.classes_[np.argmax(prediction_proba)]
             
             # Interpret results
             confidence = prediction_proba[prediction]
@@ -75,6 +137,56 @@ class PricePredictor:
         except Exception as e:
             return {"error": f"Prediction failed: {e}"}
 
+    def prepare_panel_features(self, histories, feature_engineer):
+        """
+        Build a panel with the latest feature row of every symbol
+        (index = symbol) from a dict of symbol -> historical DataFrame
+        """
+        rows = {}
+        for symbol, historical_data in histories.items():
+            if historical_data is None or len(historical_data) == 0:
+                continue
+            features, _ = self.prepare_live_features(historical_data, feature_engineer)
+            rows[symbol] = features.iloc[0]
+        
+        return pd.DataFrame.from_dict(rows, orient='index')
+    
+    def predict_batch(self, panel):
+        """
+        Score the latest feature rows of many symbols in one predict_proba call.
+        Returns a DataFrame indexed by symbol.
+        """
+        if self.model is None:
+            return pd.DataFrame({'error': ["No model loaded"]})
+        
+        try:
+            if 'symbol' in panel.columns:
+                panel = panel.set_index('symbol')
+            
+            features = panel
+            if self.feature_columns:
+                features = features.reindex(columns=self.feature_columns)
+            features = features.astype(float).fillna(0)
+            
+            proba = self.predict_proba(features)
+            prediction_index = np.argmax(proba, axis=1)
+            predictions = self.model.classes_[prediction_index]
+            
+            result = pd.DataFrame({
+                'prediction': predictions,
+                'movement': np.where(predictions == 1, "UP 📈", "DOWN 📉"),
+                'confidence': np.round(proba[np.arange(len(proba)), prediction_index], 3),
+                'probability_up': np.round(proba[:, 1], 3),
+                'probability_down': np.round(proba[:, 0], 3),
+            }, index=features.index)
+            result.index.name = 'symbol'
+            result['timestamp'] = datetime.now()
+            
+            return result
+            
+        except Exception as e:
+            return pd.DataFrame({'error': [f"Batch prediction failed: {e}"]})
+
 # Test function
 def test_prediction():
     from src.models.feature_engineering import FeatureEngineer
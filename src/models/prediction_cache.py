@@ -0,0 +1,89 @@
+import threading
+from collections import OrderedDict
+
+import pandas as pd
+
+
+class PredictionCache:
+    """
+    Memoizes predictions per (model version, symbol) until the next bar.
+
+    A prediction can only change when a new bar closes, so each entry
+    stores the last bar timestamp it was computed for; a lookup with the
+    same timestamp is a hit, a newer timestamp replaces the entry.
+    """
+
+    def __init__(self, max_entries=256):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()   # (model_version, symbol) -> (bar_timestamp, result)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def _bar_key(bar_timestamp):
+        return pd.Timestamp(bar_timestamp).value if bar_timestamp is not None else None
+
+    def get(self, model_version, symbol, bar_timestamp):
+        """Cached result for this bar, or None (counted as a miss)"""
+        key = (str(model_version), symbol)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] == self._bar_key(bar_timestamp):
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+            return None
+
+    def put(self, model_version, symbol, bar_timestamp, result):
+        key = (str(model_version), symbol)
+        with self._lock:
+            self._entries[key] = (self._bar_key(bar_timestamp), result)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def get_or_compute(self, model_version, symbol, bar_timestamp, compute):
+        """Return the cached result or call ``compute()`` and cache it (errors are not cached)"""
+        result = self.get(model_version, symbol, bar_timestamp)
+        if result is None:
+            result = compute()
+            if result is not None and 'error' not in result:
+                self.put(model_version, symbol, bar_timestamp, result)
+        return result
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        total = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': round(self.hits / total, 3) if total else 0.0,
+            'entries': len(self._entries),
+        }
+
+# Test function
+def test_prediction_cache():
+    print("🧪 Testing Prediction Cache...")
+
+    cache = PredictionCache()
+    calls = []
+
+    def compute():
+        calls.append(1)
+        return {'prediction': 1}
+
+    bar = pd.Timestamp('2025-11-06 15:00:00')
+    for _ in range(5):
+        cache.get_or_compute('v1', 'BTCUSDT', bar, compute)
+    cache.get_or_compute('v1', 'BTCUSDT', bar + pd.Timedelta(hours=1), compute)
+
+    print(f"📊 Model calls: {len(calls)}, stats: {cache.stats()}")
+    return cache
+
+if __name__ == "__main__":
+    test_prediction_cache()
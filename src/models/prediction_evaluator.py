@@ -0,0 +1,304 @@
+import json
+import os
+from collections import deque
+from datetime import datetime, timezone
+
+import numpy as np
+import pandas as pd
+
+INTERVAL_DELTAS = {'1m': '1min', '5m': '5min', '15m': '15min', '30m': '30min', '1h': '1h', '4h': '4h', '1d': '1D'}
+
+
+def _to_ns(values):
+    """Datetimes as int64 nanoseconds, whatever resolution pandas parsed them at"""
+    return pd.to_datetime(values).astype('datetime64[ns]').astype('int64').to_numpy()
+
+
+def _prediction_times_ns(values):
+    """
+    Logged prediction timestamps as naive-UTC int64 nanoseconds. Stamps
+    with an offset are converted; older logs without one were written
+    in local time.
+    """
+    values = pd.Series(values, dtype=str).reset_index(drop=True)
+    aware = values.str.contains(r'(?:Z|[+-]\d{2}:?\d{2})$')
+    times = pd.Series(pd.NaT, index=values.index, dtype='datetime64[ns]')
+    if aware.any():
+        times[aware] = pd.to_datetime(values[aware], utc=True, format='ISO8601').dt.tz_localize(None)
+    if (~aware).any():
+        times[~aware] = values[~aware].map(
+            lambda value: pd.Timestamp(datetime.fromisoformat(value).astimezone(timezone.utc)).tz_localize(None))
+    return _to_ns(times)
+
+
+def kline_cache_path(symbol, interval='1h', cache_dir='data/klines'):
+    return os.path.join(cache_dir, f'{symbol}_{interval}.csv')
+
+
+def load_cached_klines(symbol, interval='1h', cache_dir='data/klines'):
+    """Cached klines for a symbol, sorted by time (None if nothing is cached)"""
+    path = kline_cache_path(symbol, interval, cache_dir)
+    if not os.path.exists(path):
+        return None
+    return pd.read_csv(path, parse_dates=['timestamp']).sort_values('timestamp').reset_index(drop=True)
+
+
+def update_kline_cache(symbol, interval='1h', cache_dir='data/klines', collector=None, limit=500):
+    """Append newly closed klines for a symbol to its cache file"""
+    if collector is None:
+        from src.data_collection.live_data import LiveDataCollector
+        collector = LiveDataCollector()
+
+    fresh = collector.get_historical_klines(symbol, interval, limit=limit)
+    if fresh is None or len(fresh) < 2:
+        return load_cached_klines(symbol, interval, cache_dir)
+    fresh = fresh.iloc[:-1]  # last kline is still open
+
+    cached = load_cached_klines(symbol, interval, cache_dir)
+    if cached is not None:
+        fresh = pd.concat([cached, fresh]).drop_duplicates('timestamp', keep='last')
+    fresh = fresh.sort_values('timestamp').reset_index(drop=True)
+
+    os.makedirs(cache_dir, exist_ok=True)
+    fresh.to_csv(kline_cache_path(symbol, interval, cache_dir), index=False)
+    return fresh
+
+
+class PredictionEvaluator:
+    """
+    Joins logged predictions (logs/predictions.csv) with the prices that
+    followed and keeps running hit rate, Brier score and calibration.
+
+    Each prediction is matched as-of its timestamp and as-of
+    timestamp + horizon against kline close times with searchsorted.
+    Only rows added since the last checkpoint are read; rows whose
+    horizon has not closed yet are left for the next run. Rows for
+    symbols with no cached klines are skipped.
+    """
+
+    def __init__(self, log_dir='logs', horizons=('4h',), interval='1h', threshold=0.01,
+                 kline_cache_dir='data/klines', state_path=None, rolling_window=100, n_bins=10):
+        self.log_path = os.path.join(log_dir, 'predictions.csv')
+        self.state_path = state_path or os.path.join(log_dir, 'prediction_evaluation.json')
+        self.horizons = list(horizons)
+        self.interval = interval
+        self.threshold = threshold
+        self.kline_cache_dir = kline_cache_dir
+        self.rolling_window = rolling_window
+        self.n_bins = n_bins
+        self._klines = {}
+        self.state = self._load_state()
+
+    def _empty_metrics(self):
+        return {
+            'evaluated': 0,
+            'hits': 0,
+            'brier_sum': 0.0,
+            'bin_count': [0] * self.n_bins,
+            'bin_prob_sum': [0.0] * self.n_bins,
+            'bin_outcome_sum': [0] * self.n_bins,
+            'recent_hits': [],
+        }
+
+    def _load_state(self):
+        if os.path.exists(self.state_path):
+            try:
+                with open(self.state_path, 'r', encoding='utf-8') as f:
+                    state = json.load(f)
+                for horizon in self.horizons:
+                    state['metrics'].setdefault(horizon, self._empty_metrics())
+                return state
+            except Exception as e:
+                print(f"❌ Error loading evaluation state: {e}")
+        return {'rows_processed': 0, 'unmatched': 0, 'skipped': 0, 'metrics': {h: self._empty_metrics() for h in self.horizons}}
+
+    def _save_state(self):
+        directory = os.path.dirname(self.state_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = self.state_path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.state, f, indent=2)
+        os.replace(tmp_path, self.state_path)
+
+    def _close_times(self, symbol):
+        """(close_time ns array, close price array) for a symbol, cached per run"""
+        if symbol not in self._klines:
+            klines = load_cached_klines(symbol, self.interval, self.kline_cache_dir)
+            if klines is None or len(klines) == 0:
+                self._klines[symbol] = None
+            else:
+                close_time = klines['timestamp'] + pd.Timedelta(INTERVAL_DELTAS.get(self.interval, '1h'))
+                self._klines[symbol] = (_to_ns(close_time), klines['close'].to_numpy(dtype=float))
+        return self._klines[symbol]
+
+    def read_new_predictions(self):
+        """Logged predictions after the checkpoint"""
+        if not os.path.exists(self.log_path):
+            return pd.DataFrame()
+        skip = range(1, self.state['rows_processed'] + 1)
+        return pd.read_csv(self.log_path, skiprows=skip, encoding='utf-8')
+
+    def evaluate(self):
+        """Process new log rows and return the current summary"""
+        new_rows = self.read_new_predictions()
+        if len(new_rows) == 0:
+            return self.get_summary()
+
+        timestamps = _prediction_times_ns(new_rows['timestamp'])
+        horizon_ns = {h: pd.Timedelta(h).value for h in self.horizons}
+        resolved = np.zeros(len(new_rows), dtype=bool)
+        unmatched = np.zeros(len(new_rows), dtype=bool)
+        skipped = np.zeros(len(new_rows), dtype=bool)
+        # Per-row outcomes per horizon; None until every horizon is resolved
+        outcomes = {h: [None] * len(new_rows) for h in self.horizons}
+
+        for symbol, group in new_rows.groupby('symbol', sort=False):
+            klines = self._close_times(symbol)
+            positions = group.index.to_numpy()
+            if klines is None:
+                # No price history for this symbol: skip its rows (counted
+                # apart from unmatched) so they don't hold back the checkpoint
+                print(f"⚠️ No cached klines for {symbol}, skipping {len(positions)} predictions")
+                resolved[positions] = True
+                skipped[positions] = True
+                continue
+
+            close_times, closes = klines
+            t0 = timestamps[positions]
+            start_idx = np.searchsorted(close_times, t0, side='right') - 1
+
+            # Predictions made before the first cached bar can never be matched
+            matched = start_idx >= 0
+            row_resolved = np.ones(len(positions), dtype=bool)
+            for horizon in self.horizons:
+                target_time = t0 + horizon_ns[horizon]
+                end_idx = np.searchsorted(close_times, target_time, side='right') - 1
+                # The horizon is resolved once a bar closing at or after it exists
+                row_resolved &= target_time <= close_times[-1]
+                future_return = closes[end_idx] / closes[np.maximum(start_idx, 0)] - 1
+                for i, position in enumerate(positions):
+                    if matched[i]:
+                        outcomes[horizon][position] = int(future_return[i] > self.threshold)
+
+            resolved[positions] = row_resolved | ~matched
+            unmatched[positions] = ~matched
+
+        # Advance the checkpoint only over a contiguous resolved prefix
+        n_done = len(resolved) if resolved.all() else int(np.argmin(resolved))
+        probability_up = pd.to_numeric(new_rows.get('probability_up'), errors='coerce').fillna(0).clip(0, 1).to_numpy()
+        predictions = pd.to_numeric(new_rows.get('prediction'), errors='coerce')
+        predictions = predictions.fillna(pd.Series(probability_up > 0.5, index=new_rows.index).astype(int)).astype(int).to_numpy()
+
+        for position in range(n_done):
+            if outcomes[self.horizons[0]][position] is None:
+                continue
+            for horizon in self.horizons:
+                self._update_metrics(self.state['metrics'][horizon], int(predictions[position]),
+                                     float(probability_up[position]), outcomes[horizon][position])
+
+        # Rows past the checkpoint are read again next run, so only count them then
+        self.state['unmatched'] += int(unmatched[:n_done].sum())
+        self.state['skipped'] = self.state.get('skipped', 0) + int(skipped[:n_done].sum())
+        self.state['rows_processed'] += n_done
+        self.state['last_evaluated'] = datetime.now().isoformat()
+        self._save_state()
+        print(f"✅ Evaluated {n_done} new predictions ({len(new_rows) - n_done} waiting for their horizon)")
+        return self.get_summary()
+
+    def _update_metrics(self, metrics, prediction, probability_up, outcome):
+        hit = int(prediction == outcome)
+        metrics['evaluated'] += 1
+        metrics['hits'] += hit
+        metrics['brier_sum'] += (probability_up - outcome) ** 2
+
+        bin_index = min(int(probability_up * self.n_bins), self.n_bins - 1)
+        metrics['bin_count'][bin_index] += 1
+        metrics['bin_prob_sum'][bin_index] += probability_up
+        metrics['bin_outcome_sum'][bin_index] += outcome
+
+        recent = deque(metrics['recent_hits'], maxlen=self.rolling_window)
+        recent.append(hit)
+        metrics['recent_hits'] = list(recent)
+
+    def get_calibration(self, horizon=None):
+        """Mean predicted vs observed up-rate per probability bin"""
+        metrics = self.state['metrics'][horizon or self.horizons[0]]
+        rows = []
+        for i in range(self.n_bins):
+            count = metrics['bin_count'][i]
+            if count:
+                rows.append({
+                    'bin': f'{i / self.n_bins:.1f}-{(i + 1) / self.n_bins:.1f}',
+                    'count': count,
+                    'mean_predicted': round(metrics['bin_prob_sum'][i] / count, 3),
+                    'observed_rate': round(metrics['bin_outcome_sum'][i] / count, 3),
+                })
+        return pd.DataFrame(rows)
+
+    def rolling_accuracy(self, horizon=None):
+        recent = self.state['metrics'][horizon or self.horizons[0]]['recent_hits']
+        return round(sum(recent) / len(recent), 3) if recent else None
+
+    def get_summary(self):
+        summary = {'rows_processed': self.state['rows_processed'], 'unmatched': self.state['unmatched'],
+                   'skipped': self.state.get('skipped', 0), 'horizons': {}}
+        for horizon in self.horizons:
+            metrics = self.state['metrics'][horizon]
+            n = metrics['evaluated']
+            summary['horizons'][horizon] = {
+                'evaluated': n,
+                'hit_rate': round(metrics['hits'] / n, 3) if n else None,
+                'brier_score': round(metrics['brier_sum'] / n, 4) if n else None,
+                'rolling_accuracy': self.rolling_accuracy(horizon),
+            }
+        return summary
+
+    def needs_retraining(self, min_samples=50, accuracy_drop=0.1, horizon=None):
+        """
+        Drift check: True when rolling accuracy has fallen ``accuracy_drop``
+        below the long-run hit rate (or below 50%)
+        """
+        metrics = self.state['metrics'][horizon or self.horizons[0]]
+        if len(metrics['recent_hits']) < min_samples or not metrics['evaluated']:
+            return False
+        long_run = metrics['hits'] / metrics['evaluated']
+        rolling = self.rolling_accuracy(horizon)
+        return rolling < 0.5 or rolling < long_run - accuracy_drop
+
+# Test function
+def test_prediction_evaluator():
+    import tempfile
+
+    print("🧪 Testing Prediction Evaluator...")
+
+    klines = pd.read_csv('data/historical/btc_historical_20251107.csv', parse_dates=['timestamp'])
+    with tempfile.TemporaryDirectory() as directory:
+        os.makedirs(os.path.join(directory, 'klines'))
+        klines.to_csv(kline_cache_path('BTCUSDT', '1h', os.path.join(directory, 'klines')), index=False)
+
+        rng = np.random.RandomState(0)
+        times = klines['timestamp'].sample(200, random_state=0).sort_values() + pd.Timedelta(minutes=90)
+        probability_up = rng.uniform(size=200).round(3)
+        pd.DataFrame({
+            'timestamp': times.dt.strftime('%Y-%m-%dT%H:%M:%S+00:00'),
+            'symbol': 'BTCUSDT',
+            'prediction': (probability_up > 0.5).astype(int),
+            'probability_up': probability_up,
+        }).to_csv(os.path.join(directory, 'predictions.csv'), index=False)
+
+        evaluator = PredictionEvaluator(log_dir=directory, horizons=['1h', '4h'],
+                                        kline_cache_dir=os.path.join(directory, 'klines'))
+        summary = evaluator.evaluate()
+        print(f"📊 Summary: {summary}")
+        print(evaluator.get_calibration())
+        print(f"🔁 Needs retraining: {evaluator.needs_retraining()}")
+
+        # A second run only reads rows added since the checkpoint
+        assert PredictionEvaluator(log_dir=directory, horizons=['1h', '4h'],
+                                   kline_cache_dir=os.path.join(directory, 'klines')).read_new_predictions().shape[0] == 200 - summary['rows_processed']
+
+    return summary
+
+if __name__ == "__main__":
+    test_prediction_evaluator()
@@ -0,0 +1,348 @@
+"""
+Local prediction service.
+
+Run with:  python -m src.models.prediction_server --port 8765 --workers 4
+
+Holds the loaded models and the streaming feature state outside the
+Streamlit process. Predict requests are queued and scored in
+micro-batches (one predict_proba per model per batch) within a latency
+budget; with --workers > 0 batches are scored in a process pool so
+throughput scales across cores.
+"""
+import argparse
+import json
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future, ProcessPoolExecutor
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import numpy as np
+import pandas as pd
+
+from .feature_engineering import StreamingFeatureState
+from .model_registry import get_registry
+
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_PORT = 8765
+
+
+def _json_default(value):
+    if isinstance(value, (np.integer,)):
+        return int(value)
+    if isinstance(value, (np.floating,)):
+        return float(value)
+    if isinstance(value, (datetime, pd.Timestamp)):
+        return value.isoformat()
+    return str(value)
+
+
+def score_requests(directory, items):
+    """
+    Score a batch of (model_name, symbol, interval, features) items.
+    Items that resolve to the same model are scored in one predict_batch call.
+    Runs in the server thread or in a worker process.
+    """
+    registry = get_registry(directory)
+    results = [None] * len(items)
+    groups = {}
+
+    for position, (model_name, symbol, interval, features) in enumerate(items):
+        predictor = registry.get(model_name, symbol, interval)
+        if predictor is None:
+            results[position] = {'symbol': symbol, 'error': f"No model for {model_name}"}
+            continue
+        groups.setdefault(id(predictor), (predictor, []))[1].append((position, symbol, features))
+
+    for predictor, members in groups.values():
+        panel = pd.DataFrame([features for _, _, features in members],
+                             index=[f'{position}' for position, _, _ in members])
+        scored = predictor.predict_batch(panel)
+        for position, symbol, _ in members:
+            if 'error' in scored.columns:
+                results[position] = {'symbol': symbol, 'error': scored['error'].iloc[0]}
+                continue
+            row = scored.loc[f'{position}'].to_dict()
+            row['symbol'] = symbol
+            row['model_version'] = (predictor.model_info or {}).get('version', 0)
+            results[position] = row
+
+    return results
+
+
+class MicroBatcher:
+    """
+    Collects predict items from concurrent requests and scores them
+    together: a batch closes when it reaches ``max_batch_size`` items or
+    when its first item has waited ``max_latency_ms``.
+    """
+
+    def __init__(self, directory, max_batch_size=64, max_latency_ms=5, workers=0):
+        self.directory = directory
+        self.max_batch_size = max_batch_size
+        self.max_latency = max_latency_ms / 1000
+        self.pool = ProcessPoolExecutor(max_workers=workers) if workers > 0 else None
+        self.queue = queue.Queue()
+        self.stats = {'batches': 0, 'items': 0}
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def submit(self, items):
+        """Queue items; returns one Future per item"""
+        futures = []
+        for item in items:
+            future = Future()
+            self.queue.put((item, future))
+            futures.append(future)
+        return futures
+
+    def _run(self):
+        while True:
+            batch = [self.queue.get()]
+            deadline = time.monotonic() + self.max_latency
+            while len(batch) < self.max_batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self.queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+
+            self.stats['batches'] += 1
+            self.stats['items'] += len(batch)
+            items = [item for item, _ in batch]
+            futures = [future for _, future in batch]
+
+            if self.pool is None:
+                self._resolve(futures, lambda: score_requests(self.directory, items))
+            else:
+                # Don't wait: the next batch can be collected while this one scores
+                pool_future = self.pool.submit(score_requests, self.directory, items)
+                pool_future.add_done_callback(lambda f, futures=futures: self._resolve(futures, f.result))
+
+    @staticmethod
+    def _resolve(futures, get_results):
+        try:
+            results = get_results()
+        except Exception as e:
+            results = [{'error': f"Prediction failed: {e}"}] * len(futures)
+        for future, result in zip(futures, results):
+            future.set_result(result)
+
+
+class PredictionService:
+    """Models, per-(symbol, interval) feature state and the micro-batcher"""
+
+    def __init__(self, directory='src/models/saved_models', workers=0, max_batch_size=64,
+                 max_latency_ms=5, fetch_missing_bars=True):
+        self.directory = directory
+        self.registry = get_registry(directory)
+        self.batcher = MicroBatcher(directory, max_batch_size, max_latency_ms, workers)
+        self.fetch_missing_bars = fetch_missing_bars
+        self.feature_states = {}
+        self._state_lock = threading.Lock()
+        self._live_collector = None
+        self.started_at = datetime.now()
+
+    def _state(self, symbol, interval):
+        key = (symbol.upper(), interval)
+        with self._state_lock:
+            if key not in self.feature_states:
+                self.feature_states[key] = StreamingFeatureState()
+            return self.feature_states[key]
+
+    def push_bars(self, symbol, interval, bars):
+        """Feed closed bars into a symbol's streaming feature state"""
+        state = self._state(symbol, interval)
+        accepted = sum(1 for bar in bars if state.update(bar) is not None)
+        return {'symbol': symbol, 'interval': interval, 'accepted': accepted}
+
+    def _warm_up(self, symbol, interval):
+        """Fetch recent klines for a symbol nobody has pushed bars for"""
+        if self._live_collector is None:
+            from src.data_collection.live_data import LiveDataCollector
+            self._live_collector = LiveDataCollector()
+        klines = self._live_collector.get_historical_klines(symbol, interval, limit=StreamingFeatureState.WARMUP_PERIODS + 5)
+        if klines is not None:
+            # The last kline is still open; only closed bars enter the state
+            self._state(symbol, interval).update_many(klines.iloc[:-1])
+
+    def predict(self, symbols=None, rows=None, model_name='random_forest', interval='1h'):
+        """
+        Predict from streaming state (``symbols``) and/or explicit feature
+        rows (``rows``: symbol -> {feature: value})
+        """
+        items = []
+        for symbol, features in (rows or {}).items():
+            items.append((model_name, symbol, interval, features))
+
+        for symbol in symbols or []:
+            state = self._state(symbol, interval)
+            if state.latest_features is None and self.fetch_missing_bars:
+                self._warm_up(symbol, interval)
+            if state.latest_features is None:
+                items.append((model_name, symbol, interval, None))
+            else:
+                items.append((model_name, symbol, interval, dict(state.latest_features)))
+
+        ready = [item for item in items if item[3] is not None]
+        futures = iter(self.batcher.submit(ready))
+        results = []
+        for item in items:
+            if item[3] is None:
+                results.append({'symbol': item[1], 'error': "No bars for symbol"})
+            else:
+                results.append(next(futures).result())
+        return results
+
+    def health(self):
+        return {
+            'status': 'ok',
+            'pid': os.getpid(),
+            'started_at': self.started_at,
+            'symbols_tracked': len(self.feature_states),
+            'registry': self.registry.stats,
+            'batcher': self.batcher.stats,
+        }
+
+
+def make_handler(service):
+    class PredictionHandler(BaseHTTPRequestHandler):
+        def _send(self, payload, status=200):
+            body = json.dumps(payload, default=_json_default).encode('utf-8')
+            self.send_response(status)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def _read_json(self):
+            length = int(self.headers.get('Content-Length', 0))
+            return json.loads(self.rfile.read(length) or b'{}')
+
+        def do_GET(self):
+            if self.path == '/health':
+                self._send(service.health())
+            elif self.path == '/models':
+                self._send(service.registry.describe())
+            else:
+                self._send({'error': 'Not found'}, 404)
+
+        def do_POST(self):
+            try:
+                payload = self._read_json()
+                if self.path == '/predict':
+                    self._send({'predictions': service.predict(
+                        symbols=payload.get('symbols'),
+                        rows=payload.get('rows'),
+                        model_name=payload.get('model_name', 'random_forest'),
+                        interval=payload.get('interval', '1h'))})
+                elif self.path == '/bars':
+                    self._send(service.push_bars(payload['symbol'], payload.get('interval', '1h'), payload['bars']))
+                else:
+                    self._send({'error': 'Not found'}, 404)
+            except Exception as e:
+                self._send({'error': str(e)}, 400)
+
+        def log_message(self, format, *args):
+            # Keep the console quiet; errors are returned to the caller
+            pass
+
+    return PredictionHandler
+
+
+def run_server(host=DEFAULT_HOST, port=DEFAULT_PORT, **service_kwargs):
+    service = PredictionService(**service_kwargs)
+    server = ThreadingHTTPServer((host, port), make_handler(service))
+    server.daemon_threads = True
+    print(f"🚀 Prediction server listening on http://{host}:{port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("👋 Prediction server stopped")
+    finally:
+        server.server_close()
+    return server
+
+
+class PredictionClient:
+    """Thin HTTP client used by app.py and batch scripts"""
+
+    def __init__(self, url=None, timeout=2):
+        self.url = (url or os.getenv('PREDICTION_SERVER_URL') or f'http://{DEFAULT_HOST}:{DEFAULT_PORT}').rstrip('/')
+        self.timeout = timeout
+
+    def _post(self, path, payload):
+        import requests
+        try:
+            response = requests.post(self.url + path, data=json.dumps(payload, default=_json_default),
+                                     headers={'Content-Type': 'application/json'}, timeout=self.timeout)
+            if response.status_code == 200:
+                return response.json()
+            print(f"❌ Prediction server returned {response.status_code}: {response.text[:200]}")
+        except Exception as e:
+            print(f"❌ Prediction server unavailable: {e}")
+        return None
+
+    def health(self):
+        import requests
+        try:
+            return requests.get(self.url + '/health', timeout=self.timeout).json()
+        except Exception:
+            return None
+
+    def push_bars(self, symbol, bars, interval='1h'):
+        """Send closed bars (DataFrame or list of dicts) for a symbol"""
+        if isinstance(bars, pd.DataFrame):
+            bars = bars.to_dict('records')
+        return self._post('/bars', {'symbol': symbol, 'interval': interval, 'bars': bars})
+
+    def predict(self, symbols=None, rows=None, model_name='random_forest', interval='1h'):
+        """List of prediction dicts (one per symbol), or None if the server is down"""
+        if isinstance(rows, pd.DataFrame):
+            rows = rows.to_dict('index')
+        result = self._post('/predict', {'symbols': symbols, 'rows': rows,
+                                         'model_name': model_name, 'interval': interval})
+        return result.get('predictions') if result else None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local prediction server")
+    parser.add_argument('--host', default=DEFAULT_HOST)
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT)
+    parser.add_argument('--models', default='src/models/saved_models', help="Model directory")
+    parser.add_argument('--workers', type=int, default=0, help="Scoring processes (0 = score in server thread)")
+    parser.add_argument('--max-batch-size', type=int, default=64)
+    parser.add_argument('--max-latency-ms', type=float, default=5)
+    parser.add_argument('--no-fetch', action='store_true', help="Don't fetch klines for unknown symbols")
+    args = parser.parse_args()
+
+    run_server(args.host, args.port, directory=args.models, workers=args.workers,
+               max_batch_size=args.max_batch_size, max_latency_ms=args.max_latency_ms,
+               fetch_missing_bars=not args.no_fetch)
+
+# Test function
+def test_prediction_server():
+    print("🧪 Testing Prediction Server...")
+
+    service = PredictionService(fetch_missing_bars=False)
+    server = ThreadingHTTPServer((DEFAULT_HOST, 0), make_handler(service))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    client = PredictionClient(f'http://{DEFAULT_HOST}:{server.server_address[1]}')
+    bars = pd.read_csv('data/historical/sample_data.csv')
+    print(f"📥 Bars accepted: {client.push_bars('BTCUSDT', bars.tail(40))['accepted']}")
+
+    predictions = client.predict(symbols=['BTCUSDT', 'ETHUSDT'])
+    for prediction in predictions:
+        print(f"🎯 {prediction}")
+    print(f"📊 Health: {client.health()}")
+
+    server.shutdown()
+    return predictions
+
+if __name__ == "__main__":
+    main()
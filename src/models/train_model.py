@@ -7,10 +7,16 @@ from sklearn.metrics import accuracy_score, precision_score, recall_score, class
 import joblib
 import os
 
+from .hyperparameter_search import HyperparameterSearch, build_model, DEFAULT_SEARCH_DIR
+from .model_artifact import save_artifact, data_fingerprint
+
 class ModelTrainer:
     def __init__(self):
         self.models = {}
         self.model_performance = {}
+        self.best_params = {}
+        self.feature_columns = None
+        self.data_fingerprint = None
     
     def prepare_data(self, features, target, test_size=0.2, random_state=42):
         """
@@ -20,37 +26,54 @@ class ModelTrainer:
             features, target, test_size=test_size, random_state=random_state, stratify=target
         )
         
+        # Remember the schema so saved models carry it
+        self.feature_columns = list(features.columns)
+        self.data_fingerprint = data_fingerprint(features, target)
+        
         print(f"✅ Data split: Train={X_train.shape}, Test={X_test.shape}")
         return X_train, X_test, y_train, y_test
     
-    def train_logistic_regression(self, X_train, y_train):
+    def train_logistic_regression(self, X_train, y_train, params=None):
         """
         Train Logistic Regression model
         """
         print("🤖 Training Logistic Regression...")
-        model = LogisticRegression(random_state=42, max_iter=1000)
+        params = params or self.best_params.get('logistic_regression')
+        model = build_model('logistic_regression', params)
         model.fit(X_train, y_train)
         
         self.models['logistic_regression'] = model
         print("✅ Logistic Regression trained")
         return model
     
-    def train_random_forest(self, X_train, y_train):
+    def train_random_forest(self, X_train, y_train, params=None):
         """
         Train Random Forest model
         """
         print("🌲 Training Random Forest...")
-        model = RandomForestClassifier(
-            n_estimators=100,
-            random_state=42,
-            max_depth=10
-        )
+        params = params or self.best_params.get('random_forest') or {'n_estimators': 100, 'max_depth': 10}
+        model = build_model('random_forest', params)
         model.fit(X_train, y_train)
         
         self.models['random_forest'] = model
         print("✅ Random Forest trained")
         return model
     
+    def tune_hyperparameters(self, X_train, y_train, model_name, **search_kwargs):
+        """
+        Search hyperparameters with successive halving / Hyperband
+        """
+        search_kwargs.setdefault('checkpoint_path', os.path.join(DEFAULT_SEARCH_DIR, f'{model_name}_search.json'))
+        search = HyperparameterSearch(model_name, **search_kwargs)
+        best_params = dict(search.fit(X_train, y_train))
+
+        # The final model gets the full tree budget the search worked up to
+        if model_name == 'random_forest':
+            best_params['n_estimators'] = int(search.max_budget)
+
+        self.best_params[model_name] = best_params
+        return best_params
+    
     def evaluate_model(self, model, X_test, y_test, model_name):
         """
         Evaluate model performance
@@ -84,19 +107,98 @@ class ModelTrainer:
         
         return accuracy, precision, recall
     
-    def save_models(self, directory='src/models/saved_models'):
+    def save_models(self, directory='src/models/saved_models', symbol=None, interval=None):
         """
-        Save trained models using joblib
+        Save trained models with their feature schema, data fingerprint and metrics.
+        With a symbol/interval, each model is published as a new registry version instead.
         """
         # Create directory if it doesn't exist
         os.makedirs(directory, exist_ok=True)
         
+        if symbol or interval:
+            from .model_registry import ModelRegistry
+            registry = ModelRegistry(directory)
+            for model_name, model in self.models.items():
+                registry.publish(
+                    model, model_name,
+                    feature_columns=self.feature_columns or list(getattr(model, 'feature_names_in_', [])),
+                    symbol=symbol, interval=interval,
+                    metrics=self.model_performance.get(model_name),
+                    fingerprint=self.data_fingerprint,
+                    extra={'params': self.best_params.get(model_name)}
+                )
+            return
+        
         for model_name, model in self.models.items():
             filename = os.path.join(directory, f'{model_name}.pkl')
-            joblib.dump(model, filename)
+            save_artifact(
+                model, filename,
+                feature_columns=self.feature_columns or list(getattr(model, 'feature_names_in_', [])),
+                metrics=self.model_performance.get(model_name),
+                fingerprint=self.data_fingerprint,
+                model_name=model_name,
+                extra={'params': self.best_params.get(model_name)}
+            )
             print(f"💾 Saved {model_name} to {filename}")
     
-    def train_all_models(self, features, target):
+    def train_from_shards(self, shard_dir='data/processed/shards', trees_per_shard=10, symbols=None):
+        """
+        Train incrementally from dataset shards, one shard in memory at a time.
+        The last shard is held out (time-ordered) for evaluation.
+        """
+        from sklearn.linear_model import SGDClassifier
+        from sklearn.pipeline import Pipeline
+        from sklearn.preprocessing import StandardScaler
+        from .dataset_builder import iter_shards
+        
+        print("🚀 Starting Incremental Training from Shards...")
+        
+        # SGD logistic regression learns via partial_fit;
+        # the forest grows `trees_per_shard` new trees on each shard
+        sgd_model = Pipeline([
+            ('scaler', StandardScaler()),
+            ('sgd', SGDClassifier(loss='log_loss', random_state=42))
+        ])
+        rf_model = build_model('random_forest', {'max_depth': 10, 'n_estimators': 0})
+        rf_model.set_params(warm_start=True)
+        
+        held_out = None
+        n_shards = 0
+        for features, target in iter_shards(shard_dir, symbols):
+            if held_out is not None:
+                self._fit_shard(sgd_model, rf_model, *held_out, trees_per_shard)
+                n_shards += 1
+            held_out = (features, target)
+        
+        if n_shards == 0:
+            print("❌ Need at least two shards (one is held out for evaluation)")
+            return None, self.model_performance
+        
+        if rf_model.n_estimators == 0:
+            raise ValueError("No training shard contains both classes, so the random forest was never fitted; "
+                             "build larger shards or check the target variable")
+        
+        X_test, y_test = held_out
+        self.feature_columns = list(X_test.columns)
+        self.models['sgd_logistic'] = sgd_model
+        self.models['random_forest'] = rf_model
+        print(f"✅ Trained on {n_shards} shards ({rf_model.n_estimators} trees)")
+        
+        self.evaluate_model(sgd_model, X_test, y_test, 'sgd_logistic')
+        self.evaluate_model(rf_model, X_test, y_test, 'random_forest')
+        return self.models, self.model_performance
+    
+    def _fit_shard(self, sgd_model, rf_model, features, target, trees_per_shard):
+        scaler, sgd = sgd_model.named_steps['scaler'], sgd_model.named_steps['sgd']
+        scaler.partial_fit(features)
+        sgd.partial_fit(scaler.transform(features), target, classes=np.array([0, 1]))
+        
+        # A forest needs both classes in every fit
+        if target.nunique() > 1:
+            rf_model.n_estimators += trees_per_shard
+            rf_model.fit(features, target)
+    
+    def train_all_models(self, features, target, tune=False):
         """
         Complete training pipeline for all models
         """
@@ -105,6 +207,11 @@ class ModelTrainer:
         # Prepare data
         X_train, X_test, y_train, y_test = self.prepare_data(features, target)
         
+        # Optionally tune hyperparameters on the training split only
+        if tune:
+            self.tune_hyperparameters(X_train, y_train, 'logistic_regression')
+            self.tune_hyperparameters(X_train, y_train, 'random_forest')
+        
         # Train models
         lr_model = self.train_logistic_regression(X_train, y_train)
         rf_model = self.train_random_forest(X_train, y_train)
@@ -0,0 +1,165 @@
+import time
+
+import numpy as np
+
+
+def _sklearn_normalizes_leaves():
+    """
+    sklearn < 1.4 stored class counts in tree_.value and normalized them in
+    predict_proba; newer versions store fractions and use them as-is
+    """
+    try:
+        import sklearn
+        major, minor = (int(p) for p in sklearn.__version__.split('.')[:2])
+        return (major, minor) < (1, 4)
+    except Exception:
+        return False
+
+
+class FlatForest:
+    """
+    A trained sklearn forest flattened into contiguous node arrays.
+
+    All trees share one set of arrays (children, feature, threshold, leaf
+    probabilities); leaves point to themselves, so a batch is evaluated by
+    stepping every (tree, row) pair down ``max_depth`` levels with a few
+    vectorized gathers. The arithmetic mirrors sklearn exactly: inputs are
+    cast to float32, leaf values match what the installed sklearn reports,
+    and tree probabilities are summed in estimator order before averaging.
+    """
+
+    def __init__(self, model):
+        estimators = getattr(model, 'estimators_', None)
+        if not estimators or getattr(model, 'n_outputs_', 1) != 1:
+            raise ValueError("FlatForest needs a fitted single-output forest classifier")
+
+        self.classes_ = model.classes_
+        self.n_classes = len(model.classes_)
+        self.n_features_in_ = model.n_features_in_
+        self.feature_names_in_ = getattr(model, 'feature_names_in_', None)
+        self.n_trees = len(estimators)
+
+        normalize = _sklearn_normalizes_leaves()
+        left, right, feature, threshold, missing_left, values, roots = [], [], [], [], [], [], []
+        offset = 0
+        max_depth = 0
+        for estimator in estimators:
+            tree = estimator.tree_
+            n_nodes = tree.node_count
+            node_ids = np.arange(n_nodes) + offset
+            is_leaf = tree.children_left == -1
+
+            # Leaves loop back to themselves so extra steps are no-ops
+            left.append(np.where(is_leaf, node_ids, tree.children_left + offset))
+            right.append(np.where(is_leaf, node_ids, tree.children_right + offset))
+            feature.append(np.where(is_leaf, 0, tree.feature))
+            threshold.append(tree.threshold)
+            mgl = getattr(tree, 'missing_go_to_left', None)
+            missing_left.append(np.zeros(n_nodes, dtype=bool) if mgl is None else mgl.astype(bool))
+
+            # Leaf probabilities exactly as DecisionTreeClassifier.predict_proba returns them
+            value = tree.value[:, 0, :self.n_classes].astype(np.float64)
+            if normalize:
+                normalizer = value.sum(axis=1)[:, np.newaxis]
+                normalizer[normalizer == 0.0] = 1.0
+                value = value / normalizer
+            values.append(value)
+
+            roots.append(offset)
+            offset += n_nodes
+            max_depth = max(max_depth, tree.max_depth)
+
+        self.left = np.concatenate(left).astype(np.intp)
+        self.right = np.concatenate(right).astype(np.intp)
+        self.feature = np.concatenate(feature).astype(np.intp)
+        self.threshold = np.concatenate(threshold).astype(np.float64)
+        self.missing_go_to_left = np.concatenate(missing_left)
+        self.has_missing_routing = bool(self.missing_go_to_left.any())
+        self.values = np.concatenate(values)
+        self.roots = np.array(roots, dtype=np.intp)
+        self.max_depth = max_depth
+        self.n_nodes = offset
+
+    def _as_array(self, X):
+        if hasattr(X, 'columns') and self.feature_names_in_ is not None:
+            X = X[list(self.feature_names_in_)]
+        X = np.asarray(X, dtype=np.float32)
+        if X.ndim == 1:
+            X = X.reshape(1, -1)
+        if X.shape[1] != self.n_features_in_:
+            raise ValueError(f"Expected {self.n_features_in_} features, got {X.shape[1]}")
+        return X
+
+    def apply(self, X):
+        """Leaf node index of every (tree, row) pair, shape (n_trees, n_rows)"""
+        X = self._as_array(X)
+        n_rows = X.shape[0]
+        rows = np.arange(n_rows)[np.newaxis, :]
+        nodes = np.repeat(self.roots[:, np.newaxis], n_rows, axis=1)
+
+        for _ in range(self.max_depth):
+            x = X[rows, self.feature[nodes]]
+            go_left = x <= self.threshold[nodes]
+            if self.has_missing_routing:
+                go_left |= np.isnan(x) & self.missing_go_to_left[nodes]
+            nodes = np.where(go_left, self.left[nodes], self.right[nodes])
+
+        return nodes
+
+    def predict_proba(self, X):
+        leaf_values = self.values[self.apply(X)]
+        # cumsum adds trees strictly in order, matching sklearn's accumulation
+        proba = np.cumsum(leaf_values, axis=0)[-1]
+        proba /= self.n_trees
+        return proba
+
+    def predict(self, X):
+        return self.classes_.take(np.argmax(self.predict_proba(X), axis=1), axis=0)
+
+
+def compile_model(model):
+    """
+    Return a FlatForest for forest classifiers, or None if the model
+    should keep using its own predict_proba
+    """
+    try:
+        from sklearn.ensemble import ExtraTreesClassifier, RandomForestClassifier
+    except ImportError:
+        return None
+
+    if isinstance(model, (RandomForestClassifier, ExtraTreesClassifier)):
+        try:
+            return FlatForest(model)
+        except Exception as e:
+            print(f"⚠️  Could not compile forest, using sklearn inference: {e}")
+    return None
+
+# Test function
+def test_tree_inference():
+    import pandas as pd
+    from sklearn.ensemble import RandomForestClassifier
+
+    print("🧪 Testing Flattened Tree Inference...")
+
+    rng = np.random.RandomState(0)
+    X = pd.DataFrame(rng.normal(size=(2000, 14)), columns=[f'f{i}' for i in range(14)])
+    y = (X['f0'] + X['f1'] * X['f2'] + rng.normal(scale=0.5, size=2000) > 0).astype(int)
+    model = RandomForestClassifier(n_estimators=100, max_depth=10, random_state=42).fit(X, y)
+
+    engine = FlatForest(model)
+    X_new = pd.DataFrame(rng.normal(size=(500, 14)), columns=X.columns)
+    assert np.array_equal(engine.predict_proba(X_new), model.predict_proba(X_new))
+    assert np.array_equal(engine.predict(X_new), model.predict(X_new))
+    print("✅ Predictions identical to sklearn")
+
+    row = X_new.iloc[:1].to_numpy()
+    for name, fn in [('sklearn', lambda: model.predict_proba(X_new.iloc[:1])), ('flat', lambda: engine.predict_proba(row))]:
+        start = time.perf_counter()
+        for _ in range(200):
+            fn()
+        print(f"⏱️  {name}: {(time.perf_counter() - start) / 200 * 1e6:.0f} µs per row")
+
+    return engine
+
+if __name__ == "__main__":
+    test_tree_inference()
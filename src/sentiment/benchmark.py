@@ -0,0 +1,271 @@
+"""
+Sentiment throughput benchmarks.
+
+Scores fixed corpora (the recorded headlines in data/sentiment/headlines.txt
+and a seeded synthetic mix of headlines and tweets) at several sizes and
+reports items/s, p50/p99 latency and peak traced memory for:
+
+    text      AdvancedSentimentAnalyzer.analyze_text, one call per item
+    batch     analyze_texts on batches of --batch-size items
+    source    analyze_news_source on groups of 50 items (per-source aggregation)
+    pipeline  the streaming pipeline into a DecayedSentimentState
+
+Caching is disabled, but batch scoring and the pipeline drop repeated
+texts, so items/s counts the items actually scored (on the recorded
+corpus that is fewer than its size). Each run is appended to a CSV
+together with the git commit, so runs can be compared across commits:
+
+    python -m src.sentiment.benchmark --sizes 1000 10000
+    python -m src.sentiment.benchmark --compare <old commit> <new commit>
+"""
+import argparse
+import csv
+import os
+import platform
+import random
+import subprocess
+import time
+import tracemalloc
+from datetime import datetime
+from typing import Callable, Dict, List
+
+import numpy as np
+
+try:
+    from .sentiment_analyzer import AdvancedSentimentAnalyzer
+    from .fast_polarity import load_corpus
+    from .pipeline import build_pipeline
+    from .sentiment_state import DecayedSentimentState
+    from .symbol_tagger import SymbolTagger
+except ImportError:
+    from sentiment_analyzer import AdvancedSentimentAnalyzer
+    from fast_polarity import load_corpus
+    from pipeline import build_pipeline
+    from sentiment_state import DecayedSentimentState
+    from symbol_tagger import SymbolTagger
+
+DEFAULT_RESULTS_PATH = 'data/benchmarks/sentiment_benchmarks.csv'
+BENCHMARKS = ('text', 'batch', 'source', 'pipeline')
+RESULT_COLUMNS = ['run_at', 'commit', 'benchmark', 'engine', 'corpus', 'size', 'items', 'seconds',
+                  'items_per_second', 'p50_ms', 'p99_ms', 'peak_memory_mb', 'python', 'cpus']
+
+_SUBJECTS = ['Bitcoin', 'BTC', '$BTC', 'Ethereum', 'ETH', '$ETH', 'Solana', '$SOL', 'Cardano', 'ADA',
+             'XRP', 'Dogecoin', '$DOGE', 'Chainlink', 'Polkadot', 'Litecoin', 'Avalanche', 'BNB']
+_VERBS = ['surges', 'rallies', 'slides', 'crashes', 'climbs', 'dips', 'jumps', 'tumbles', 'holds steady', 'breaks out']
+_DRIVERS = ['ETF inflows', 'regulatory concerns', 'whale accumulation', 'an exchange outage', 'a liquidation wave',
+            'strong institutional demand', 'recession fears', 'a network upgrade', 'an SEC lawsuit', 'record volume']
+_STANCES = ['turn bullish', 'stay cautious', 'warn of more risk', 'see a recovery', 'expect a breakdown']
+_PHRASES = ['to the moon', 'looking weak here', 'buying the dip', 'rekt again', 'support holding',
+            'bear flag forming', 'not selling', 'great entry', 'worst week ever', 'no fear, just gains']
+_EMOJIS = ['🚀', '📉', '😱', '🔥', ':)', ':(', '']
+
+
+def synthetic_corpus(size: int, seed: int = 7) -> List[str]:
+    """Deterministic mix of headline- and tweet-like texts"""
+    rng = random.Random(seed)
+    texts = []
+    for _ in range(size):
+        kind = rng.random()
+        subject = rng.choice(_SUBJECTS)
+        if kind < 0.35:
+            texts.append(f"{subject} {rng.choice(_VERBS)} {rng.randint(1, 30)}% as {rng.choice(_DRIVERS)} hit the market")
+        elif kind < 0.55:
+            texts.append(f"Analysts {rng.choice(_STANCES)} on {subject} after {rng.choice(_DRIVERS)}")
+        else:
+            texts.append(f"{subject} {rng.choice(_PHRASES)} {rng.choice(_EMOJIS)} "
+                         f"{rng.choice(_PHRASES) if rng.random() < 0.3 else ''}".strip())
+    return texts
+
+
+def build_corpus(name: str, size: int, seed: int = 7) -> List[str]:
+    """
+    'recorded' cycles the headline file (so it repeats, like re-collected
+    news); 'synthetic' is generated and mostly unique
+    """
+    if name == 'recorded':
+        headlines = load_corpus()
+        return [headlines[i % len(headlines)] for i in range(size)]
+    if name == 'synthetic':
+        return synthetic_corpus(size, seed)
+    raise ValueError(f"Unknown corpus: {name}")
+
+
+def git_commit() -> str:
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                                timeout=10).stdout.strip()
+        dirty = subprocess.run(['git', 'status', '--porcelain', '--untracked-files=no'], capture_output=True,
+                               text=True, timeout=30).stdout.strip()
+        return f"{commit}-dirty" if commit and dirty else (commit or 'unknown')
+    except Exception:
+        return 'unknown'
+
+
+def _run_text(analyzer, texts):
+    latencies = []
+    for text in texts:
+        start = time.perf_counter()
+        analyzer.analyze_text(text)
+        latencies.append(time.perf_counter() - start)
+    return len(texts), latencies
+
+
+def _run_batch(analyzer, texts, batch_size=500, workers=1):
+    latencies = []
+    scored = 0
+    for i in range(0, len(texts), batch_size):
+        start = time.perf_counter()
+        analyzer.analyze_texts(texts[i:i + batch_size], workers=workers)
+        latencies.append(time.perf_counter() - start)
+        # Repeats within a batch are scored once
+        scored += analyzer.last_batch_stats['scored']
+    return scored, latencies
+
+
+def _run_source(analyzer, texts, group_size=50):
+    latencies = []
+    for i in range(0, len(texts), group_size):
+        group = [{'source': 'benchmark', 'title': text} for text in texts[i:i + group_size]]
+        start = time.perf_counter()
+        analyzer.analyze_news_source(group)
+        latencies.append(time.perf_counter() - start)
+    return len(texts), latencies
+
+
+def _run_pipeline(analyzer, texts, tagger=None):
+    tagger = tagger or SymbolTagger()
+    items = ({'source': 'benchmark', 'title': text} for text in texts)
+    stream = build_pipeline(items, analyzer, tagger.tag, DecayedSentimentState(path=None), dedupe_window=1000)
+    latencies = []
+    last = time.perf_counter()
+    for _ in stream:
+        now = time.perf_counter()
+        latencies.append(now - last)
+        last = now
+    # One latency per item that got past dedupe and was scored
+    return len(latencies), latencies
+
+
+def measure(run: Callable, memory: bool = True) -> Dict:
+    """Time one benchmark run, then repeat it under tracemalloc for peak memory"""
+    start = time.perf_counter()
+    items, latencies = run()
+    elapsed = time.perf_counter() - start
+
+    peak_mb = None
+    if memory:
+        tracemalloc.start()
+        run()
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        peak_mb = round(peak / 1e6, 3)
+
+    latencies_ms = np.array(latencies) * 1000 if latencies else np.array([np.nan])
+    return {
+        'items': items,
+        'seconds': round(elapsed, 4),
+        'items_per_second': round(items / elapsed, 1) if elapsed > 0 else None,
+        'p50_ms': round(float(np.percentile(latencies_ms, 50)), 4),
+        'p99_ms': round(float(np.percentile(latencies_ms, 99)), 4),
+        'peak_memory_mb': peak_mb
+    }
+
+
+def run_benchmarks(sizes=(1000, 10000), engines=('fast', 'textblob'), corpora=('recorded', 'synthetic'),
+                   benchmarks=BENCHMARKS, batch_size: int = 500, workers: int = 1, memory: bool = True,
+                   results_path: str = DEFAULT_RESULTS_PATH) -> List[Dict]:
+    """Run every combination and append the rows to ``results_path`` (if set)"""
+    commit = git_commit()
+    run_at = datetime.now().isoformat(timespec='seconds')
+    tagger = SymbolTagger()
+    rows = []
+
+    for engine in engines:
+        analyzer = AdvancedSentimentAnalyzer(engine=engine, cache=False)
+        analyzer.analyze_text("warm up the lexicons")
+        for corpus in corpora:
+            for size in sizes:
+                texts = build_corpus(corpus, size)
+                runners = {
+                    'text': lambda: _run_text(analyzer, texts),
+                    'batch': lambda: _run_batch(analyzer, texts, batch_size, workers),
+                    'source': lambda: _run_source(analyzer, texts),
+                    'pipeline': lambda: _run_pipeline(analyzer, texts, tagger),
+                }
+                for benchmark in benchmarks:
+                    result = measure(runners[benchmark], memory)
+                    row = dict(run_at=run_at, commit=commit, benchmark=benchmark, engine=engine, corpus=corpus,
+                               size=size, python=platform.python_version(), cpus=os.cpu_count(), **result)
+                    rows.append(row)
+                    print(f"📊 {benchmark:<8} {engine:<8} {corpus:<9} n={size:<6} scored={row['items']:<6} "
+                          f"{row['items_per_second']:>10} items/s  p50 {row['p50_ms']:.3f} ms  "
+                          f"p99 {row['p99_ms']:.3f} ms  peak {row['peak_memory_mb']} MB")
+
+    if results_path and rows:
+        directory = os.path.dirname(results_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        write_header = not os.path.exists(results_path)
+        with open(results_path, 'a', newline='', encoding='utf-8') as f:
+            writer = csv.DictWriter(f, fieldnames=RESULT_COLUMNS)
+            if write_header:
+                writer.writeheader()
+            writer.writerows(rows)
+        print(f"✅ {len(rows)} results appended to {results_path} (commit {commit})")
+    return rows
+
+
+def compare_runs(baseline: str, candidate: str, results_path: str = DEFAULT_RESULTS_PATH) -> List[Dict]:
+    """Throughput ratio candidate/baseline per benchmark, using each commit's latest run"""
+    import pandas as pd
+
+    results = pd.read_csv(results_path)
+    keys = ['benchmark', 'engine', 'corpus', 'size']
+
+    def latest(commit):
+        rows = results[results['commit'] == commit]
+        return rows[rows['run_at'] == rows['run_at'].max()].set_index(keys)
+
+    old, new = latest(baseline), latest(candidate)
+    if old.empty or new.empty:
+        print(f"❌ No results for {baseline if old.empty else candidate} in {results_path}")
+        return []
+
+    joined = old[['items_per_second', 'p99_ms']].join(new[['items_per_second', 'p99_ms']], how='inner',
+                                                      lsuffix='_old', rsuffix='_new')
+    joined['speedup'] = (joined['items_per_second_new'] / joined['items_per_second_old']).round(2)
+    print(f"📊 {candidate} vs {baseline}:")
+    print(joined.to_string())
+    return joined.reset_index().to_dict('records')
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Sentiment throughput benchmarks")
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 10000])
+    parser.add_argument('--engines', nargs='+', default=['fast', 'textblob'], choices=AdvancedSentimentAnalyzer.ENGINES)
+    parser.add_argument('--corpora', nargs='+', default=['recorded', 'synthetic'], choices=['recorded', 'synthetic'])
+    parser.add_argument('--benchmarks', nargs='+', default=list(BENCHMARKS), choices=BENCHMARKS)
+    parser.add_argument('--batch-size', type=int, default=500)
+    parser.add_argument('--workers', type=int, default=1, help="Processes for the batch benchmark")
+    parser.add_argument('--no-memory', action='store_true', help="Skip the tracemalloc pass")
+    parser.add_argument('--results', default=DEFAULT_RESULTS_PATH, help="CSV the results are appended to")
+    parser.add_argument('--compare', nargs=2, metavar=('BASELINE', 'CANDIDATE'),
+                        help="Compare two commits' results instead of running")
+    args = parser.parse_args()
+
+    if args.compare:
+        compare_runs(args.compare[0], args.compare[1], args.results)
+        return
+    run_benchmarks(args.sizes, args.engines, args.corpora, args.benchmarks, args.batch_size,
+                   args.workers, not args.no_memory, args.results)
+
+# Test function
+def test_benchmark():
+    """Run a small benchmark without recording it"""
+    print("🧪 Testing Sentiment Benchmarks...")
+    print(f"  Synthetic sample: {synthetic_corpus(3)}")
+    rows = run_benchmarks(sizes=[200], engines=['fast'], results_path=None)
+    return rows
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,192 @@
+import hashlib
+import re
+from collections import OrderedDict
+from typing import Dict, List, Optional
+
+import numpy as np
+
+# Largest prime below 2**32: (a * x + b) % p stays inside uint64 for 32-bit x
+_PRIME = 4294967291
+_URL = re.compile(r'https?://\S+')
+_TOKEN = re.compile(r'[a-z0-9]+')
+STOPWORDS = {
+    'the', 'a', 'an', 'and', 'or', 'of', 'to', 'in', 'on', 'for', 'with', 'as', 'at', 'by',
+    'is', 'are', 'was', 'were', 'be', 'it', 'its', 'this', 'that', 'from', 'after', 'amid'
+}
+
+
+def item_text(item: Dict) -> str:
+    """The text of a news item as it is scored (title + content)"""
+    return f"{item.get('title', '')} {item.get('content', '')}"
+
+
+def normalize_news_text(text: str) -> str:
+    """Lower-case, URLs dropped, punctuation and whitespace collapsed"""
+    return ' '.join(_TOKEN.findall(_URL.sub(' ', str(text).lower())))
+
+
+def _token_hash(token: str) -> int:
+    return int.from_bytes(hashlib.blake2b(token.encode('utf-8'), digest_size=4).digest(), 'little')
+
+
+class NewsDeduplicator:
+    """
+    Collapses exact and near-duplicate news items.
+
+    Exact copies are caught by a hash of the normalized text. Reworded
+    copies are caught with MinHash signatures over the content words
+    and a banded LSH index: items sharing any band are candidates,
+    confirmed when the estimated Jaccard similarity reaches
+    ``threshold``. The first item of a story is kept and records
+    where its duplicates came from (``sources``, ``duplicate_count`` and
+    the first ``max_provenance`` entries of ``duplicates``).
+
+    With ``max_items`` the index forgets its oldest stories, so it can
+    run over an unbounded stream.
+    """
+
+    def __init__(self, threshold: float = 0.6, num_perm: int = 64, bands: int = 16,
+                 max_items: Optional[int] = None, max_provenance: int = 20, seed: int = 1):
+        if num_perm % bands:
+            raise ValueError("num_perm must be a multiple of bands")
+        self.threshold = threshold
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.max_items = max_items
+        self.max_provenance = max_provenance
+
+        rng = np.random.RandomState(seed)
+        self._a = rng.randint(1, _PRIME, size=num_perm, dtype=np.uint64)
+        self._b = rng.randint(0, _PRIME, size=num_perm, dtype=np.uint64)
+        self.reset()
+
+    def reset(self):
+        self._items = OrderedDict()     # id -> (item, signature, band keys, exact hash)
+        self._exact = {}                # exact hash -> id
+        self._buckets = {}              # (band, bytes) -> set of ids
+        self._next_id = 0
+        self.stats = {'seen': 0, 'unique': 0, 'exact_duplicates': 0, 'near_duplicates': 0}
+
+    def tokens(self, text: str) -> set:
+        return {token for token in normalize_news_text(text).split() if token not in STOPWORDS}
+
+    def signature(self, tokens: set) -> Optional[np.ndarray]:
+        """MinHash signature (None for texts without content words)"""
+        if not tokens:
+            return None
+        hashes = np.array([_token_hash(token) for token in tokens], dtype=np.uint64)
+        permuted = (np.outer(hashes, self._a) + self._b) % np.uint64(_PRIME)
+        return permuted.min(axis=0)
+
+    def _band_keys(self, signature):
+        return [(band, signature[band * self.rows:(band + 1) * self.rows].tobytes()) for band in range(self.bands)]
+
+    def find_duplicate(self, item: Dict):
+        """(canonical item or None, 'exact' | 'near' | None, exact hash, signature)"""
+        text = item_text(item)
+        exact_hash = hashlib.sha1(normalize_news_text(text).encode('utf-8')).hexdigest()
+        if exact_hash in self._exact:
+            return self._items[self._exact[exact_hash]][0], 'exact', exact_hash, None
+
+        signature = self.signature(self.tokens(text))
+        if signature is not None:
+            candidates = set()
+            for key in self._band_keys(signature):
+                candidates.update(self._buckets.get(key, ()))
+            if candidates:
+                candidates = list(candidates)
+                similarity = (np.stack([self._items[c][1] for c in candidates]) == signature).mean(axis=1)
+                best = int(np.argmax(similarity))
+                if similarity[best] >= self.threshold:
+                    return self._items[candidates[best]][0], 'near', exact_hash, signature
+        return None, None, exact_hash, signature
+
+    def add(self, item: Dict) -> Optional[Dict]:
+        """
+        Index an item. Returns the kept copy of a new story, or None when
+        the item was merged into an earlier one as a duplicate.
+        """
+        self.stats['seen'] += 1
+        canonical, kind, exact_hash, signature = self.find_duplicate(item)
+
+        if canonical is not None:
+            self.stats[f'{kind}_duplicates'] += 1
+            source = item.get('source', 'unknown')
+            if source not in canonical['sources']:
+                canonical['sources'].append(source)
+            # The same story fetched per symbol keeps every symbol's tag
+            if item.get('symbols'):
+                canonical['symbols'] = list(dict.fromkeys(list(canonical.get('symbols') or []) + list(item['symbols'])))
+            canonical['duplicate_count'] += 1
+            if len(canonical['duplicates']) < self.max_provenance:
+                canonical['duplicates'].append({
+                    'source': source,
+                    'title': item.get('title', item.get('content', ''))[:120],
+                    'url': item.get('url'),
+                    'match': kind
+                })
+            return None
+
+        kept = dict(item)
+        kept['symbols'] = list(item.get('symbols') or [])
+        kept['sources'] = [item.get('source', 'unknown')]
+        kept['duplicates'] = []
+        kept['duplicate_count'] = 0
+
+        item_id = self._next_id
+        self._next_id += 1
+        band_keys = self._band_keys(signature) if signature is not None else []
+        self._items[item_id] = (kept, signature, band_keys, exact_hash)
+        self._exact[exact_hash] = item_id
+        for key in band_keys:
+            self._buckets.setdefault(key, set()).add(item_id)
+        self.stats['unique'] += 1
+
+        if self.max_items is not None and len(self._items) > self.max_items:
+            self._evict_oldest()
+        return kept
+
+    def _evict_oldest(self):
+        old_id, (_, _, band_keys, exact_hash) = self._items.popitem(last=False)
+        if self._exact.get(exact_hash) == old_id:
+            del self._exact[exact_hash]
+        for key in band_keys:
+            bucket = self._buckets.get(key)
+            if bucket is not None:
+                bucket.discard(old_id)
+                if not bucket:
+                    del self._buckets[key]
+
+    def deduplicate(self, items: List[Dict]) -> List[Dict]:
+        """Unique stories in first-seen order, each with its provenance"""
+        unique = []
+        for item in items:
+            kept = self.add(item)
+            if kept is not None:
+                unique.append(kept)
+        return unique
+
+# Test function
+def test_deduplication():
+    """Test near-duplicate detection"""
+    print("🧪 Testing News Deduplicator...")
+
+    items = [
+        {'source': 'binance', 'title': 'Bitcoin ETF Approval Expected Soon - Market Bullish',
+         'content': 'Major financial institutions are optimistic about Bitcoin ETF approval in the coming weeks.'},
+        {'source': 'crypto_news', 'title': 'Market bullish: Bitcoin ETF approval expected soon',
+         'content': 'Major financial institutions optimistic about Bitcoin ETF approval in coming weeks'},
+        {'source': 'twitter', 'content': 'BITCOIN ETF APPROVAL EXPECTED SOON - MARKET BULLISH! Major financial institutions are optimistic about Bitcoin ETF approval in the coming weeks.'},
+        {'source': 'twitter', 'content': 'Market correction expected for altcoins. Taking profits on ADA and SOL.'},
+    ]
+
+    deduplicator = NewsDeduplicator()
+    unique = deduplicator.deduplicate(items)
+    for item in unique:
+        print(f"  - {item.get('title', item.get('content'))[:50]}... sources={item['sources']}")
+    print(f"📊 Stats: {deduplicator.stats}")
+    return unique
+
+if __name__ == "__main__":
+    test_deduplication()
@@ -0,0 +1,122 @@
+from collections import deque
+from typing import Dict, Iterable, List, Tuple
+
+
+def _is_word_char(char: str) -> bool:
+    return char.isalnum() or char == '_'
+
+
+class LexiconMatcher:
+    """
+    Aho–Corasick automaton over a set of terms.
+
+    Built once, it finds every term in a single pass over the text, so
+    the cost depends on the text length rather than the lexicon size.
+    Matches must sit on word boundaries ("bull" does not match inside
+    "bullish") and overlapping matches resolve leftmost-longest
+    ("resistance broken" wins over "resistance").
+    """
+
+    def __init__(self, terms: Iterable[Tuple[str, object]], case_sensitive: bool = False):
+        self.case_sensitive = case_sensitive
+        # Node arrays: goto transitions, failure link, (length, payload) of the
+        # longest term ending here, and the next node on the output chain
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._output: List[Tuple[int, object, str]] = [None]
+        self._dict_link: List[int] = [-1]
+        self.terms: Dict[str, object] = {}
+
+        for term, payload in terms:
+            key = self._normalize(term.strip())
+            if key and key not in self.terms:
+                self.terms[key] = payload
+                self._add(key, payload)
+        self._build_links()
+
+    def _normalize(self, text: str) -> str:
+        return text if self.case_sensitive else text.lower()
+
+    def _add(self, term: str, payload):
+        node = 0
+        for char in term:
+            next_node = self._goto[node].get(char)
+            if next_node is None:
+                next_node = len(self._goto)
+                self._goto[node][char] = next_node
+                self._goto.append({})
+                self._fail.append(0)
+                self._output.append(None)
+                self._dict_link.append(-1)
+            node = next_node
+        self._output[node] = (len(term), payload, term)
+
+    def _build_links(self):
+        queue = deque()
+        for child in self._goto[0].values():
+            queue.append(child)
+
+        while queue:
+            node = queue.popleft()
+            for char, child in self._goto[node].items():
+                queue.append(child)
+                fail = self._fail[node]
+                while fail and char not in self._goto[fail]:
+                    fail = self._fail[fail]
+                candidate = self._goto[fail].get(char, 0)
+                self._fail[child] = candidate if candidate != child else 0
+                target = self._fail[child]
+                self._dict_link[child] = target if self._output[target] is not None else self._dict_link[target]
+
+    def find_all(self, text: str) -> List[Tuple[int, int, str, object]]:
+        """Every boundary-respecting match as (start, end, term, payload), possibly overlapping"""
+        text = self._normalize(text)
+        goto, fail, output, dict_link = self._goto, self._fail, self._output, self._dict_link
+        text_length = len(text)
+        matches = []
+        node = 0
+
+        for position, char in enumerate(text):
+            while node and char not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(char, 0)
+
+            hit = node if output[node] is not None else dict_link[node]
+            while hit > 0:
+                length, payload, term = output[hit]
+                start, end = position - length + 1, position + 1
+                if ((start == 0 or not _is_word_char(text[start - 1])) and
+                        (end == text_length or not _is_word_char(text[end]))):
+                    matches.append((start, end, term, payload))
+                hit = dict_link[hit]
+
+        return matches
+
+    def find(self, text: str) -> List[Tuple[int, int, str, object]]:
+        """Non-overlapping matches, leftmost-longest first"""
+        selected = []
+        last_end = -1
+        for match in sorted(self.find_all(text), key=lambda m: (m[0], m[0] - m[1])):
+            if match[0] >= last_end:
+                selected.append(match)
+                last_end = match[1]
+        return selected
+
+# Test function
+def test_lexicon_matcher():
+    """Test the lexicon matcher"""
+    print("🧪 Testing Lexicon Matcher...")
+
+    matcher = LexiconMatcher([
+        ("bull", "positive"), ("bullish", "strong_positive"), ("risk", "negative"),
+        ("resistance", "technical_negative"), ("resistance broken", "technical_positive"),
+    ])
+
+    text = "Bullish setup: resistance broken, low risk (not an asterisk). Bull run?"
+    for start, end, term, payload in matcher.find(text):
+        print(f"  - '{term}' -> {payload} at {start}:{end}")
+
+    return matcher
+
+if __name__ == "__main__":
+    test_lexicon_matcher()
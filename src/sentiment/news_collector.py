@@ -2,18 +2,70 @@ import requests
 import pandas as pd
 from datetime import datetime, timedelta
 import time
-import re
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait
 from typing import List, Dict
 import json
+import os
+import sys
+
+# Fix imports - try both relative and absolute
+try:
+    from .deduplication import NewsDeduplicator
+    from .news_cursors import CursorStore
+    from .symbol_tagger import SymbolTagger
+except ImportError:
+    try:
+        from deduplication import NewsDeduplicator
+        from news_cursors import CursorStore
+        from symbol_tagger import SymbolTagger
+    except ImportError:
+        current_dir = os.path.dirname(os.path.abspath(__file__))
+        parent_dir = os.path.dirname(current_dir)
+        if parent_dir not in sys.path:
+            sys.path.append(parent_dir)
+        from sentiment.deduplication import NewsDeduplicator
+        from sentiment.news_cursors import CursorStore
+        from sentiment.symbol_tagger import SymbolTagger
 
 
 class NewsDataCollector:
-    def __init__(self):
+    def __init__(self, collection_deadline: float = 5.0, incremental: bool = False,
+                 cursor_path: str = None, max_pages: int = 5, symbol_tagger: SymbolTagger = None):
+        """
+        incremental: fetch only items newer than each source's persisted
+        cursor (pollers, backfills). Every new item is returned, since the
+        cursor moves past all of them, and failed requests return nothing
+        instead of sample data. The default returns the latest items on
+        every call, as the dashboard expects.
+        symbol_tagger: tagger for the asset universe (default: the 12 dashboard coins)
+        """
         self.sources = {
             'binance': self.get_binance_news,
             'twitter': self.get_twitter_sentiment,
             'crypto_news': self.get_crypto_news
         }
+        self.symbol_tagger = symbol_tagger or SymbolTagger()
+        # Sources queried per symbol (called as fetch(symbol, limit))
+        self.symbol_sources = {'twitter'}
+        self.fallbacks = {
+            'binance': self.get_sample_binance_news,
+            'twitter': self.get_sample_twitter_data,
+            'crypto_news': self.get_sample_crypto_news
+        }
+        
+        # Concurrent collection: overall deadline, plus fetches that
+        # missed it (merged into the next collect_all_news call)
+        self.collection_deadline = collection_deadline
+        self._executor = None
+        self._inflight = {}
+        self._lock = threading.Lock()
+        self.last_collection_stats = {}
+        
+        # Incremental fetching: per-source cursors persisted between runs
+        self.incremental = incremental
+        self.max_pages = max_pages
+        self.cursors = CursorStore(cursor_path) if cursor_path else (CursorStore() if incremental else None)
         
     def get_binance_news(self, limit=10) -> List[Dict]:
         """Fetch latest news from Binance"""
@@ -21,18 +73,41 @@ class NewsDataCollector:
             # Binance API for news (public endpoint)
             url = "https://www.binance.com/bapi/composite/v1/public/cms/article/list/query"
             
-            payload = {
-                "catalogId": 48,  # Crypto news catalog
-                "type": 1,
-                "pageNo": 1,
-                "pageSize": limit
-            }
+            last_release = self.cursors.get('binance').get('last_release_ms', 0) if self.incremental else 0
+            articles = []
+            # True once paging reaches the cursor (or the end of the list)
+            caught_up = False
             
-            response = requests.post(url, json=payload, timeout=10)
+            # Newest first: keep paging until an already-seen article shows up
+            for page in range(1, (self.max_pages if self.incremental else 1) + 1):
+                payload = {
+                    "catalogId": 48,  # Crypto news catalog
+                    "type": 1,
+                    "pageNo": page,
+                    "pageSize": limit
+                }
+                
+                response = requests.post(url, json=payload, timeout=10)
+                if response.status_code != 200:
+                    break
+                
+                page_articles = response.json().get('data', {}).get('articles', [])
+                new_articles = [a for a in page_articles if a.get('releaseDate', 0) > last_release]
+                articles.extend(new_articles)
+                if len(new_articles) < len(page_articles) or len(page_articles) < limit:
+                    caught_up = True
+                    break
             
-            if response.status_code == 200:
-                data = response.json()
-                articles = data.get('data', {}).get('articles', [])
+            if response.status_code == 200 or articles:
+                if self.incremental and articles:
+                    if caught_up or not last_release:
+                        self.cursors.update('binance', last_release_ms=max(a.get('releaseDate', 0) for a in articles))
+                    else:
+                        # Older unseen articles lie beyond the pages fetched: keep the
+                        # cursor so they are not skipped (the newest ones repeat next poll)
+                        oldest = datetime.fromtimestamp(min(a.get('releaseDate', 0) for a in articles) / 1000)
+                        print(f"⚠️ Binance news gap: {self.max_pages} pages only reach back to "
+                              f"{oldest:%Y-%m-%d %H:%M}, cursor not advanced")
                 
                 news_list = []
                 for article in articles:
@@ -52,7 +127,7 @@ class NewsDataCollector:
             print(f"❌ Error fetching Binance news: {e}")
         
         # Fallback to sample Binance news
-        return self.get_sample_binance_news()
+        return [] if self.incremental else self.get_sample_binance_news()
 
     def get_twitter_sentiment(self, query="bitcoin", limit=15) -> List[Dict]:
         """Fetch Twitter sentiment data (using free API)"""
@@ -60,15 +135,22 @@ class NewsDataCollector:
             # Using free Twitter API alternative or web scraping
             # Note: For production, you'd use Twitter API v2 with proper authentication
             url = f"https://api.stocktwits.com/api/2/streams/symbol/{query}.json"
+            cursor_key = f"twitter:{query.lower()}"
+            since_id = self.cursors.get(cursor_key).get('since_id') if self.incremental else None
             
-            response = requests.get(url, timeout=10)
+            response = requests.get(url, params={'since': since_id} if since_id else None, timeout=10)
             
             if response.status_code == 200:
                 data = response.json()
                 messages = data.get('messages', [])
+                if since_id:
+                    messages = [msg for msg in messages if msg.get('id', 0) > since_id]
+                if self.incremental and messages:
+                    self.cursors.update(cursor_key, since_id=max(msg.get('id', 0) for msg in messages))
                 
                 tweets = []
-                for msg in messages[:limit]:
+                # The cursor now covers every new message, so return them all
+                for msg in (messages if self.incremental else messages[:limit]):
                     tweets.append({
                         'source': 'twitter',
                         'content': msg.get('body', ''),
@@ -85,7 +167,7 @@ class NewsDataCollector:
             print(f"❌ Error fetching Twitter data: {e}")
         
         # Fallback to sample Twitter data
-        return self.get_sample_twitter_data()
+        return [] if self.incremental else self.get_sample_twitter_data()
 
     def get_crypto_news(self, limit=10) -> List[Dict]:
         """Fetch general crypto news from free APIs"""
@@ -98,14 +180,36 @@ class NewsDataCollector:
                 'kind': 'news'
             }
             
-            response = requests.get(url, params=params, timeout=10)
+            cursor = self.cursors.get('crypto_news') if self.incremental else {}
+            headers = {}
+            if cursor.get('etag'):
+                headers['If-None-Match'] = cursor['etag']
+            if cursor.get('last_modified'):
+                headers['If-Modified-Since'] = cursor['last_modified']
+            
+            response = requests.get(url, params=params, headers=headers, timeout=10)
+            
+            if response.status_code == 304:
+                # Nothing new since the last poll: no items, not samples
+                print("✅ Crypto news unchanged since last poll")
+                return []
             
             if response.status_code == 200:
                 data = response.json()
                 posts = data.get('results', [])
+                if self.incremental:
+                    last_published = cursor.get('last_published_at', '')
+                    posts = [post for post in posts if post.get('published_at', '') > last_published]
+                    self.cursors.update(
+                        'crypto_news',
+                        etag=response.headers.get('ETag'),
+                        last_modified=response.headers.get('Last-Modified'),
+                        last_published_at=max((post.get('published_at', '') for post in posts), default=None)
+                    )
                 
                 news_list = []
-                for post in posts[:limit]:
+                # The cursor now covers every new post, so return them all
+                for post in (posts if self.incremental else posts[:limit]):
                     news_list.append({
                         'source': 'crypto_news',
                         'title': post.get('title', ''),
@@ -122,14 +226,11 @@ class NewsDataCollector:
         except Exception as e:
             print(f"❌ Error fetching crypto news: {e}")
         
-        return self.get_sample_crypto_news()
+        return [] if self.incremental else self.get_sample_crypto_news()
 
     def extract_symbols_from_text(self, text: str) -> List[str]:
-        """Extract cryptocurrency symbols from text"""
-        # Common crypto symbols pattern
-        symbols_pattern = r'\b(BTC|ETH|ADA|SOL|DOT|XRP|BNB|DOGE|MATIC|LTC|AVAX|LINK)\b'
-        symbols = re.findall(symbols_pattern, text.upper())
-        return list(set(symbols))  # Remove duplicates
+        """Extract cryptocurrency symbols (tickers, names, cashtags) from text"""
+        return self.symbol_tagger.tag(text)
 
     def get_sample_binance_news(self) -> List[Dict]:
         """Sample Binance news for fallback"""
@@ -140,7 +241,8 @@ class NewsDataCollector:
                 'content': 'Major financial institutions are optimistic about Bitcoin ETF approval in the coming weeks.',
                 'publish_time': datetime.now() - timedelta(hours=2),
                 'symbols': ['BTC'],
-                'url': '#'
+                'url': '#',
+                'fallback': True
             },
             {
                 'source': 'binance', 
@@ -148,7 +250,8 @@ class NewsDataCollector:
                 'content': 'Latest Ethereum network upgrade improves scalability and reduces gas fees significantly.',
                 'publish_time': datetime.now() - timedelta(hours=5),
                 'symbols': ['ETH'],
-                'url': '#'
+                'url': '#',
+                'fallback': True
             }
         ]
 
@@ -161,7 +264,8 @@ class NewsDataCollector:
                 'user': 'CryptoExpert',
                 'created_at': datetime.now() - timedelta(minutes=30),
                 'sentiment': 'bullish',
-                'symbols': ['BTC']
+                'symbols': ['BTC'],
+                'fallback': True
             },
             {
                 'source': 'twitter',
@@ -169,7 +273,8 @@ class NewsDataCollector:
                 'user': 'TraderPro',
                 'created_at': datetime.now() - timedelta(minutes=45),
                 'sentiment': 'bearish', 
-                'symbols': ['ADA', 'SOL']
+                'symbols': ['ADA', 'SOL'],
+                'fallback': True
             }
         ]
 
@@ -183,27 +288,113 @@ class NewsDataCollector:
                 'published_at': datetime.now() - timedelta(hours=1),
                 'symbols': ['BTC', 'ETH'],
                 'url': '#',
-                'votes': {'positive': 15, 'negative': 2}
+                'votes': {'positive': 15, 'negative': 2},
+                'fallback': True
             }
         ]
 
-    def collect_all_news(self, crypto_symbol='BTC', limit_per_source=5):
-        """Collect news from all sources for a given cryptocurrency"""
+    def fetch_source(self, name, crypto_symbol, limit):
+        fetch = self.sources[name]
+        if name in self.symbol_sources:
+            return fetch(crypto_symbol.lower(), limit)
+        return fetch(limit)
+
+    def _fallback(self, name) -> List[Dict]:
+        """Sample items for a failed source; they carry 'fallback': True"""
+        fallback = self.fallbacks.get(name)
+        # Incremental consumers must not mistake samples for new items
+        return fallback() if fallback and not self.incremental else []
+
+    def collect_all_news(self, crypto_symbol='BTC', limit_per_source=5, deadline=None, dedupe=True):
+        """
+        Collect news from all sources for a given cryptocurrency (or a list
+        of them: each source is fetched once, per-symbol sources once per
+        symbol). Sources are fetched concurrently; a source that misses the deadline
+        falls back to sample data and its result is merged into the next call.
+        With dedupe, a story reported by several sources is kept once
+        (see NewsDeduplicator for the provenance fields).
+        """
+        deadline = self.collection_deadline if deadline is None else deadline
+        symbols = [crypto_symbol] if isinstance(crypto_symbol, str) else list(crypto_symbol)
         all_news = []
         
         try:
-            # Get news from each source
-            binance_news = self.get_binance_news(limit_per_source)
-            twitter_data = self.get_twitter_sentiment(crypto_symbol.lower(), limit_per_source)
-            crypto_news = self.get_crypto_news(limit_per_source)
-            
-            # Filter news relevant to the requested symbol
-            for news_list in [binance_news, twitter_data, crypto_news]:
-                for news in news_list:
-                    if crypto_symbol in news.get('symbols', []) or not news.get('symbols'):
+            start = time.time()
+            source_news = {}
+            stats = {}
+            
+            with self._lock:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(max_workers=16, thread_name_prefix='news-source')
+                
+                # One task per source, or per (source, symbol) for per-symbol sources
+                tasks = {}
+                for name in self.sources:
+                    if name in self.symbol_sources:
+                        for symbol in symbols:
+                            tasks[f"{name}:{symbol.lower()}"] = (name, symbol)
+                    else:
+                        tasks[name] = (name, symbols[0])
+                
+                submitted = {}
+                for task, (name, symbol) in tasks.items():
+                    previous = self._inflight.get(task)
+                    if previous is not None and not previous.done():
+                        # Still stalled from an earlier call: don't pile up requests
+                        source_news[task] = self._fallback(name)
+                        stats[task] = {'status': 'stalled', 'items': len(source_news[task])}
+                        continue
+                    if previous is not None:
+                        # Finished after the last deadline: merge it now
+                        late = previous.result() if previous.exception() is None else []
+                        source_news[task] = list(late or [])
+                        stats[task] = {'status': 'late', 'items': len(source_news[task])}
+                    future = self._executor.submit(self.fetch_source, name, symbol, limit_per_source)
+                    submitted[task] = future
+                    self._inflight[task] = future
+            
+            wait(list(submitted.values()), timeout=deadline)
+            
+            for task, future in submitted.items():
+                name = tasks[task][0]
+                news = source_news.setdefault(task, [])
+                if not future.done():
+                    if not news:
+                        news.extend(self._fallback(name))
+                    stats[task] = {'status': 'timeout', 'items': len(news)}
+                    continue
+                
+                with self._lock:
+                    self._inflight.pop(task, None)
+                try:
+                    fresh = future.result() or []
+                    status = 'ok'
+                except Exception as e:
+                    print(f"❌ Error fetching {name}: {e}")
+                    fresh = self._fallback(name)
+                    status = 'error'
+                
+                # Fresh items after any late ones, without repeats
+                seen = {(item.get('title'), item.get('content'), item.get('url')) for item in news}
+                news.extend(item for item in fresh if (item.get('title'), item.get('content'), item.get('url')) not in seen)
+                merged = stats.get(task, {}).get('items', 0)
+                stats[task] = {'status': status, 'items': len(news), 'late_items': merged}
+            
+            # Filter news relevant to the requested symbols
+            wanted = set(symbols)
+            for task in tasks:
+                for news in source_news.get(task, []):
+                    if wanted.intersection(news.get('symbols', [])) or not news.get('symbols'):
                         all_news.append(news)
             
-            print(f"✅ Collected {len(all_news)} total news items for {crypto_symbol}")
+            collected = len(all_news)
+            if dedupe:
+                all_news = NewsDeduplicator().deduplicate(all_news)
+            
+            self.last_collection_stats = {'seconds': round(time.time() - start, 3), 'sources': stats,
+                                          'collected': collected, 'duplicates_removed': collected - len(all_news)}
+            print(f"✅ Collected {len(all_news)} total news items for {', '.join(symbols)} "
+                  f"in {self.last_collection_stats['seconds']}s")
             return all_news
             
         except Exception as e:
@@ -232,6 +423,7 @@ def test_news_collector():
     # Test collection for BTC
     all_btc_news = collector.collect_all_news('BTC', 2)
     print(f"📊 All BTC News: {len(all_btc_news)} items")
+    print(f"⏱️ Collection stats: {collector.last_collection_stats}")
     
     return collector
 
@@ -0,0 +1,89 @@
+import json
+import os
+import threading
+from datetime import datetime
+from typing import Dict
+
+DEFAULT_CURSOR_PATH = 'data/cache/news_cursors.json'
+
+
+class CursorStore:
+    """
+    Per-source fetch cursors persisted as JSON between runs.
+
+    A cursor is a small dict whose fields depend on the source: the last
+    release time seen (Binance), the last published_at plus the ETag and
+    Last-Modified validators (CryptoPanic), or the highest message id
+    per symbol (StockTwits). Every update is written atomically.
+    """
+
+    def __init__(self, path: str = DEFAULT_CURSOR_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+        self.cursors = self._load()
+
+    def _load(self) -> Dict:
+        if self.path and os.path.exists(self.path):
+            try:
+                with open(self.path, 'r', encoding='utf-8') as f:
+                    return json.load(f)
+            except Exception as e:
+                print(f"❌ Error loading news cursors: {e}")
+        return {}
+
+    def _save(self):
+        if not self.path:
+            return
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = self.path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.cursors, f, indent=2)
+        os.replace(tmp_path, self.path)
+
+    def get(self, source: str) -> Dict:
+        with self._lock:
+            return dict(self.cursors.get(source, {}))
+
+    def update(self, source: str, **fields):
+        """Merge fields into a source's cursor (None values are skipped) and persist"""
+        with self._lock:
+            cursor = self.cursors.setdefault(source, {})
+            cursor.update({key: value for key, value in fields.items() if value is not None})
+            cursor['updated_at'] = datetime.now().isoformat()
+            try:
+                self._save()
+            except Exception as e:
+                print(f"❌ Error saving news cursors: {e}")
+
+    def reset(self, source: str = None):
+        """Forget one source's cursor, or all of them"""
+        with self._lock:
+            if source is None:
+                self.cursors = {}
+            else:
+                self.cursors.pop(source, None)
+            self._save()
+
+# Test function
+def test_news_cursors():
+    """Test cursor persistence"""
+    import tempfile
+
+    print("🧪 Testing News Cursors...")
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'cursors.json')
+        store = CursorStore(path)
+        store.update('binance', last_release_ms=1730900000000)
+        store.update('crypto_news', etag='"abc"', last_modified=None)
+
+        reloaded = CursorStore(path)
+        print(f"  binance: {reloaded.get('binance')}")
+        print(f"  crypto_news: {reloaded.get('crypto_news')}")
+
+    return reloaded
+
+if __name__ == "__main__":
+    test_news_cursors()
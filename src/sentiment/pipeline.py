@@ -0,0 +1,233 @@
+"""
+Streaming news-to-signal pipeline.
+
+Each stage is a generator that takes an iterable of news items and
+yields items, so stages compose lazily:
+
+    fetch -> normalize -> tag_symbols -> dedupe -> score -> aggregate
+
+Nothing is materialized: the dedupe index is bounded, the aggregator
+keeps one running state per (symbol, source), and ``buffered`` runs an
+upstream stage in its own thread behind a bounded queue, so a slow
+consumer blocks the producer (backpressure) instead of growing memory.
+"""
+import queue
+import threading
+import time
+from datetime import datetime
+from typing import Callable, Dict, Iterable, Iterator, List, Optional
+
+try:
+    from .deduplication import NewsDeduplicator, item_text
+    from .sentiment_state import TIMESTAMP_FIELDS
+except ImportError:
+    from deduplication import NewsDeduplicator, item_text
+    from sentiment_state import TIMESTAMP_FIELDS
+
+_END = object()
+
+
+def fetch(collector, symbols: List[str] = ('BTC',), poll_interval: float = 60.0,
+          max_polls: Optional[int] = None, limit_per_source: int = 20) -> Iterator[Dict]:
+    """
+    Poll every source of a NewsDataCollector forever (or ``max_polls``
+    times). Use an incremental collector so each poll yields only new items.
+    Sample items a collector falls back to ('fallback': True) are dropped.
+    """
+    polls = 0
+    while max_polls is None or polls < max_polls:
+        started = time.time()
+        for name in collector.sources:
+            queries = symbols if name in collector.symbol_sources else [None]
+            for symbol in queries:
+                try:
+                    items = collector.fetch_source(name, symbol or '', limit_per_source)
+                except Exception as e:
+                    print(f"❌ Error polling {name}: {e}")
+                    continue
+                for item in items or []:
+                    if not item.get('fallback'):
+                        yield item
+        polls += 1
+        if max_polls is None or polls < max_polls:
+            time.sleep(max(poll_interval - (time.time() - started), 0))
+
+
+def normalize(items: Iterable[Dict]) -> Iterator[Dict]:
+    """Give every item 'text' and 'timestamp' fields; drop items without text"""
+    for item in items:
+        text = ' '.join(item_text(item).split())
+        if not text:
+            continue
+        item = dict(item)
+        item['text'] = text
+        timestamp = next((item[field] for field in TIMESTAMP_FIELDS if item.get(field) is not None), None)
+        item['timestamp'] = timestamp if timestamp is not None else datetime.now()
+        yield item
+
+
+def tag_symbols(items: Iterable[Dict], extract: Callable[[str], List[str]]) -> Iterator[Dict]:
+    """Fill 'symbols' for items that don't carry any"""
+    for item in items:
+        if not item.get('symbols'):
+            item['symbols'] = extract(item['text'])
+        yield item
+
+
+def dedupe(items: Iterable[Dict], deduplicator: NewsDeduplicator = None, max_items: int = 10000) -> Iterator[Dict]:
+    """Drop repeats of stories seen among the last ``max_items`` unique stories"""
+    deduplicator = deduplicator or NewsDeduplicator(max_items=max_items)
+    for item in items:
+        kept = deduplicator.add(item)
+        if kept is not None:
+            yield kept
+
+
+def score(items: Iterable[Dict], analyzer) -> Iterator[Dict]:
+    """Attach polarity, confidence and label from the sentiment analyzer"""
+    for item in items:
+        result = analyzer.analyze_text(item['text'])
+        if result is None:
+            continue
+        item['polarity'] = result['polarity']
+        item['confidence'] = result['confidence']
+        item['sentiment'] = result['sentiment']
+        yield item
+
+
+class SentimentAggregator:
+    """Running count / mean polarity / mean confidence per (symbol, source)"""
+
+    def __init__(self):
+        self.state = {}
+
+    def update(self, item: Dict):
+        for symbol in item.get('symbols') or ['ALL']:
+            key = (symbol, item.get('source', 'unknown'))
+            count, polarity_sum, confidence_sum = self.state.get(key, (0, 0.0, 0.0))
+            self.state[key] = (count + 1, polarity_sum + item['polarity'], confidence_sum + item['confidence'])
+
+    def snapshot(self) -> Dict:
+        """{symbol: {source: {'count', 'average_polarity', 'average_confidence'}}}"""
+        result = {}
+        for (symbol, source), (count, polarity_sum, confidence_sum) in self.state.items():
+            result.setdefault(symbol, {})[source] = {
+                'count': count,
+                'average_polarity': round(polarity_sum / count, 3),
+                'average_confidence': round(confidence_sum / count, 3)
+            }
+        return result
+
+
+def aggregate(items: Iterable[Dict], aggregator) -> Iterator[Dict]:
+    """Fold each scored item into ``aggregator`` (anything with update(item)) and pass it on"""
+    for item in items:
+        aggregator.update(item)
+        yield item
+
+
+def buffered(items: Iterable, maxsize: int = 100) -> Iterator:
+    """
+    Run ``items`` in a background thread behind a queue of ``maxsize``.
+    The producer blocks while the queue is full; errors are re-raised here.
+    """
+    buffer = queue.Queue(maxsize=maxsize)
+    stop = threading.Event()
+
+    def put(value):
+        """Block until there is room, unless the consumer has stopped"""
+        while not stop.is_set():
+            try:
+                buffer.put(value, timeout=0.5)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def produce():
+        try:
+            for item in items:
+                if not put(item):
+                    return
+            put(_END)
+        except Exception as e:
+            put(e)
+
+    threading.Thread(target=produce, daemon=True, name='pipeline-buffer').start()
+    try:
+        while True:
+            item = buffer.get()
+            if item is _END:
+                return
+            if isinstance(item, Exception):
+                raise item
+            yield item
+    finally:
+        # Consumer stopped early: let the producer thread exit
+        stop.set()
+
+
+def build_pipeline(items: Iterable[Dict], analyzer, extract_symbols: Callable[[str], List[str]],
+                   aggregator=None, buffer_size: int = 100, dedupe_window: int = 10000) -> Iterator[Dict]:
+    """
+    Compose the stages over any item source (``fetch(...)``, a file
+    reader, a list). Fetching and scoring run in different threads,
+    decoupled by bounded buffers.
+    """
+    stream = buffered(items, buffer_size)
+    stream = normalize(stream)
+    stream = tag_symbols(stream, extract_symbols)
+    stream = dedupe(stream, max_items=dedupe_window)
+    stream = buffered(score(stream, analyzer), buffer_size)
+    if aggregator is not None:
+        stream = aggregate(stream, aggregator)
+    return stream
+
+
+def run_pipeline(collector, analyzer, symbols: List[str] = ('BTC',), poll_interval: float = 60.0,
+                 max_polls: Optional[int] = None, aggregator=None, buffer_size: int = 100):
+    """
+    Live pipeline: poll the collector's sources and stream scored items.
+    Returns (stream, aggregator); the aggregator can be read while the stream runs.
+    """
+    aggregator = aggregator if aggregator is not None else SentimentAggregator()
+    stream = build_pipeline(fetch(collector, symbols, poll_interval, max_polls), analyzer,
+                            collector.extract_symbols_from_text, aggregator, buffer_size)
+    return stream, aggregator
+
+# Test function
+def test_pipeline():
+    """Test the streaming pipeline on a synthetic firehose"""
+    import itertools
+    import tracemalloc
+
+    try:
+        from .sentiment_analyzer import AdvancedSentimentAnalyzer
+    except ImportError:
+        from sentiment_analyzer import AdvancedSentimentAnalyzer
+
+    print("🧪 Testing Streaming Sentiment Pipeline...")
+
+    analyzer = AdvancedSentimentAnalyzer(engine="fast", cache=False)
+    with open('data/sentiment/headlines.txt', 'r', encoding='utf-8') as f:
+        headlines = [line.strip() for line in f if line.strip()]
+    sources = itertools.cycle(['binance', 'crypto_news', 'twitter', 'binance'])
+    firehose = ({'source': next(sources), 'title': title} for title in itertools.cycle(headlines))
+
+    aggregator = SentimentAggregator()
+    stream = build_pipeline(itertools.islice(firehose, 20000), analyzer, analyzer.news_collector.extract_symbols_from_text,
+                            aggregator, buffer_size=50, dedupe_window=50)
+
+    tracemalloc.start()
+    start = time.time()
+    processed = sum(1 for _ in stream)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    print(f"📊 {processed} items in {time.time() - start:.2f}s, peak traced memory {peak / 1e6:.1f} MB")
+    for symbol, sources_state in aggregator.snapshot().items():
+        print(f"  {symbol}: {sources_state}")
+    return aggregator
+
+if __name__ == "__main__":
+    test_pipeline()
@@ -1,18 +1,26 @@
 from textblob import TextBlob
 import pandas as pd
 from datetime import datetime
-from typing import Dict, List
+from typing import Dict, Iterable, List
+from concurrent.futures import ProcessPoolExecutor
 import sys
 import os
+import time
 
 # Fix imports - try both relative and absolute
 try:
     # When running as part of package
     from .news_collector import NewsDataCollector
+    from .lexicon_matcher import LexiconMatcher
+    from .fast_polarity import FastPolarityEngine, ENGINE_VERSION as FAST_ENGINE_VERSION
+    from .sentiment_cache import SentimentCache, normalize_text, lexicon_hash
 except ImportError:
     try:
         # When running directly
         from news_collector import NewsDataCollector
+        from lexicon_matcher import LexiconMatcher
+        from fast_polarity import FastPolarityEngine, ENGINE_VERSION as FAST_ENGINE_VERSION
+        from sentiment_cache import SentimentCache, normalize_text, lexicon_hash
     except ImportError:
         # Final fallback - add to path
         current_dir = os.path.dirname(os.path.abspath(__file__))
@@ -20,11 +28,55 @@ except ImportError:
         if parent_dir not in sys.path:
             sys.path.append(parent_dir)
         from sentiment.news_collector import NewsDataCollector
+        from sentiment.lexicon_matcher import LexiconMatcher
+        from sentiment.fast_polarity import FastPolarityEngine, ENGINE_VERSION as FAST_ENGINE_VERSION
+        from sentiment.sentiment_cache import SentimentCache, normalize_text, lexicon_hash
+
+# Bump when the scoring formula in compute_sentiment changes (invalidates caches)
+ANALYZER_VERSION = "2"
+
+# Columns returned by AdvancedSentimentAnalyzer.analyze_texts
+BATCH_COLUMNS = ['polarity', 'confidence', 'financial_score', 'base_polarity',
+                 'subjectivity', 'total_keywords', 'sentiment']
+
+# Analyzer held by each process-pool worker (built once by the initializer)
+_worker_analyzer = None
+
+
+def _init_sentiment_worker(financial_lexicon, engine="textblob"):
+    """Build a lightweight analyzer in a worker: lexicon only, no news collector"""
+    global _worker_analyzer
+    analyzer = AdvancedSentimentAnalyzer.__new__(AdvancedSentimentAnalyzer)
+    analyzer.financial_lexicon = financial_lexicon
+    analyzer.engine = engine
+    analyzer.sentiment_cache = None
+    analyzer.build_lexicon_matcher()
+    _worker_analyzer = analyzer
+
+
+def _score_chunk(texts):
+    results = [_worker_analyzer.compute_sentiment(text) for text in texts]
+    # The caller has the texts; don't ship them back
+    return [{k: v for k, v in result.items() if k != 'text'} if result else None for result in results]
+
 
 class AdvancedSentimentAnalyzer:
-    def __init__(self):
-        print("✅ Advanced Sentiment Analyzer Initialized")
+    ENGINES = ("textblob", "fast")
+
+    def __init__(self, engine: str = "textblob", cache=True, sentiment_state=None):
+        """
+        engine: "textblob" (TextBlob pattern analyzer) or "fast"
+        (FastPolarityEngine, same rules on a precompiled lexicon)
+        cache: True for the default SentimentCache, a SentimentCache, or False/None
+        sentiment_state: a DecayedSentimentState that every compared article is folded into
+        """
+        if engine not in self.ENGINES:
+            raise ValueError(f"Unknown sentiment engine: {engine}")
+        print(f"✅ Advanced Sentiment Analyzer Initialized ({engine} engine)")
+        self.engine = engine
         self.news_collector = NewsDataCollector()
+        self.sentiment_cache = SentimentCache() if cache is True else (cache or None)
+        self.sentiment_state = sentiment_state
         
         # Enhanced financial lexicon with weights
         self.financial_lexicon = {
@@ -53,28 +105,79 @@ class AdvancedSentimentAnalyzer:
                 "weight": -0.6
             }
         }
+        self.build_lexicon_matcher()
+
+    def build_lexicon_matcher(self):
+        """
+        Compile the financial lexicon into one matcher (and the fast engine).
+        Call again after editing ``financial_lexicon``. A term listed in
+        several categories counts only for the first one.
+        """
+        self.lexicon_matcher = LexiconMatcher(
+            (word, category)
+            for category, data in self.financial_lexicon.items()
+            for word in data['words']
+        )
+        self.fast_engine = FastPolarityEngine(self.financial_lexicon) if self.engine == "fast" else None
+        if self.sentiment_cache is not None:
+            self.sentiment_cache.set_namespace(self.cache_namespace())
+        return self.lexicon_matcher
+
+    def engine_version(self) -> str:
+        if self.engine == "fast":
+            return FAST_ENGINE_VERSION
+        try:
+            from importlib.metadata import version
+            return f"textblob-{version('textblob')}"
+        except Exception:
+            return "textblob"
+
+    def cache_namespace(self) -> str:
+        """Cache entries are only valid for this analyzer version, engine and lexicon"""
+        return f"v{ANALYZER_VERSION}:{self.engine_version()}:{lexicon_hash(self.financial_lexicon)}"
 
     def analyze_text(self, text: str) -> Dict:
         """
-        Advanced financial sentiment analysis
+        Advanced financial sentiment analysis, memoized by text hash
+        """
+        if self.sentiment_cache is not None:
+            cached = self.sentiment_cache.get(text)
+            if cached is not None:
+                cached['text'] = text
+                return cached
+        
+        result = self.compute_sentiment(text)
+        if self.sentiment_cache is not None:
+            self.sentiment_cache.put(text, result)
+        return result
+
+    def compute_sentiment(self, text: str) -> Dict:
+        """
+        Advanced financial sentiment analysis (uncached)
         """
         try:
-            text_str = str(text).lower()
-            
-            # Base sentiment from TextBlob
-            analysis = TextBlob(text_str)
-            base_polarity = analysis.sentiment.polarity
-            base_subjectivity = analysis.sentiment.subjectivity
+            text_str = normalize_text(text)
             
             # Financial keyword analysis
-            financial_score = 0
             keyword_matches = {}
             
-            for category, data in self.financial_lexicon.items():
-                matches = [word for word in data['words'] if word in text_str]
-                if matches:
-                    keyword_matches[category] = matches
-                    financial_score += data['weight'] * len(matches)
+            if self.fast_engine is not None:
+                # Base polarity and keywords in one pass
+                base_polarity, base_subjectivity, keyword_matches = self.fast_engine.score(text_str)
+            else:
+                # Base sentiment from TextBlob
+                analysis = TextBlob(text_str)
+                base_polarity = analysis.sentiment.polarity
+                base_subjectivity = analysis.sentiment.subjectivity
+                
+                # One pass over the text; each distinct term counts once
+                for _, _, word, category in self.lexicon_matcher.find(text_str):
+                    matches = keyword_matches.setdefault(category, [])
+                    if word not in matches:
+                        matches.append(word)
+            
+            financial_score = sum(self.financial_lexicon[category]['weight'] * len(matches)
+                                  for category, matches in keyword_matches.items())
             
             # Combine base polarity with financial score
             # Financial keywords have stronger influence
@@ -118,6 +221,60 @@ class AdvancedSentimentAnalyzer:
             print(f"Error in sentiment analysis: {e}")
             return None
 
+    def analyze_texts(self, texts: Iterable[str], workers: int = None, chunk_size: int = 500) -> pd.DataFrame:
+        """
+        Score many texts, chunked across a process pool.
+        Cached and repeated texts are scored once.
+        Returns one row per input text, in input order, with BATCH_COLUMNS.
+        """
+        texts = [str(text) for text in texts]
+        start = time.time()
+        workers = workers or os.cpu_count() or 1
+        
+        # Look up the cache first; only distinct misses are scored
+        results = [None] * len(texts)
+        pending = {}
+        for position, text in enumerate(texts):
+            cached = self.sentiment_cache.get(text) if self.sentiment_cache is not None else None
+            if cached is not None:
+                results[position] = cached
+            else:
+                pending.setdefault(normalize_text(text), []).append(position)
+        unique = list(pending)
+        
+        if workers == 1 or len(unique) <= chunk_size:
+            scored = [self.compute_sentiment(text) for text in unique]
+        else:
+            chunks = [unique[i:i + chunk_size] for i in range(0, len(unique), chunk_size)]
+            with ProcessPoolExecutor(max_workers=workers, initializer=_init_sentiment_worker,
+                                     initargs=(self.financial_lexicon, self.engine)) as pool:
+                scored = [result for chunk_results in pool.map(_score_chunk, chunks) for result in chunk_results]
+        
+        for text, result in zip(unique, scored):
+            if self.sentiment_cache is not None:
+                self.sentiment_cache.put(text, result)
+            for position in pending[text]:
+                results[position] = result
+        if self.sentiment_cache is not None:
+            self.sentiment_cache.flush()
+        
+        rows = [(float('nan'),) * 5 + (0, None) if result is None else tuple(result[column] for column in BATCH_COLUMNS)
+                for result in results]
+        
+        elapsed = time.time() - start
+        self.last_batch_stats = {
+            'items': len(texts),
+            'scored': len(unique),
+            'cache_hits': len(texts) - sum(len(positions) for positions in pending.values()),
+            'workers': workers,
+            'seconds': round(elapsed, 3),
+            'items_per_second': round(len(texts) / elapsed, 1) if elapsed > 0 else None
+        }
+        print(f"📊 Scored {len(texts)} texts in {elapsed:.2f}s "
+              f"({self.last_batch_stats['items_per_second']} texts/s, {workers} workers, "
+              f"{self.last_batch_stats['cache_hits']} cached)")
+        return pd.DataFrame(rows, columns=BATCH_COLUMNS)
+
     def analyze_news_source(self, source_data: List[Dict]) -> Dict:
         """
         Analyze sentiment for a specific news source
@@ -126,8 +283,6 @@ class AdvancedSentimentAnalyzer:
             return None
             
         sentiments = []
-        total_items = len(source_data)
-        
         for item in source_data:
             text = item.get('title', '') + ' ' + item.get('content', '')
             sentiment_result = self.analyze_text(text)
@@ -135,6 +290,10 @@ class AdvancedSentimentAnalyzer:
             if sentiment_result:
                 sentiments.append(sentiment_result)
         
+        return self._summarize_source(source_data, sentiments)
+
+    def _summarize_source(self, source_data: List[Dict], sentiments: List[Dict]) -> Dict:
+        """Aggregate the scored articles of one source"""
         if not sentiments:
             return None
         
@@ -159,7 +318,7 @@ class AdvancedSentimentAnalyzer:
             'overall_sentiment': overall_sentiment,
             'average_polarity': round(avg_polarity, 3),
             'average_confidence': round(avg_confidence, 3),
-            'total_articles': total_items,
+            'total_articles': len(source_data),
             'analyzed_articles': len(sentiments),
             'sentiment_breakdown': {
                 'BULLISH': len([s for s in sentiments if s['polarity'] > 0.1]),
@@ -169,35 +328,8 @@ class AdvancedSentimentAnalyzer:
             'sample_articles': source_data[:3]  # First 3 articles for display
         }
 
-    def compare_sources_sentiment(self, crypto_symbol: str = "BTC") -> Dict:
-        """
-        Compare sentiment across different news sources
-        """
-        print(f"🔍 Comparing sentiment across sources for {crypto_symbol}...")
-        
-        # Collect news from all sources
-        all_news = self.news_collector.collect_all_news(crypto_symbol)
-        
-        if not all_news:
-            print("❌ No news collected for comparison")
-            return None
-        
-        # Group news by source
-        news_by_source = {}
-        for news in all_news:
-            source = news.get('source')
-            if source not in news_by_source:
-                news_by_source[source] = []
-            news_by_source[source].append(news)
-        
-        # Analyze each source
-        source_analysis = {}
-        for source, news_list in news_by_source.items():
-            analysis = self.analyze_news_source(news_list)
-            if analysis:
-                source_analysis[source] = analysis
-        
-        # Calculate overall market sentiment
+    def _summarize_market(self, crypto_symbol: str, source_analysis: Dict) -> Dict:
+        """Overall market sentiment from the per-source analyses"""
         if source_analysis:
             total_polarity = sum(analysis['average_polarity'] for analysis in source_analysis.values())
             overall_polarity = total_polarity / len(source_analysis)
@@ -225,6 +357,77 @@ class AdvancedSentimentAnalyzer:
             'analysis_time': datetime.now()
         }
 
+    def compare_sources_sentiment(self, crypto_symbol: str = "BTC") -> Dict:
+        """
+        Compare sentiment across different news sources
+        """
+        return self.compare_symbols_sentiment([crypto_symbol]).get(crypto_symbol)
+
+    def compare_symbols_sentiment(self, symbols: List[str]) -> Dict:
+        """
+        Compare sentiment across sources for several symbols at once.
+        News is collected once, every article is scored once, and the
+        scores are routed to symbols through a symbol -> article index
+        (untagged articles count for every symbol).
+        Returns {symbol: same result as compare_sources_sentiment}.
+        """
+        symbols = list(dict.fromkeys(symbols))
+        print(f"🔍 Comparing sentiment across sources for {', '.join(symbols)}...")
+        
+        # Collect news from all sources, once for all symbols
+        all_news = self.news_collector.collect_all_news(symbols)
+        
+        if not all_news:
+            print("❌ No news collected for comparison")
+            return {symbol: None for symbol in symbols}
+        
+        # Score each article once
+        scores = self.analyze_texts([news.get('title', '') + ' ' + news.get('content', '') for news in all_news])
+        sentiments = [None if pd.isna(row['polarity']) else row for row in scores.to_dict('records')]
+        
+        # Keep the rolling per-(symbol, source) state current. Sample items from
+        # a failed source are not news; untagged items go to the ALL series
+        if self.sentiment_state is not None:
+            for news, sentiment in zip(all_news, sentiments):
+                if sentiment is not None and not news.get('fallback'):
+                    self.sentiment_state.update(dict(news, polarity=sentiment['polarity']))
+            self.sentiment_state.save()
+        
+        # Inverted index: symbol -> positions of its articles
+        untagged = [i for i, news in enumerate(all_news) if not news.get('symbols')]
+        index = {symbol: [] for symbol in symbols}
+        for i, news in enumerate(all_news):
+            for symbol in news.get('symbols') or []:
+                if symbol in index:
+                    index[symbol].append(i)
+        
+        results = {}
+        for symbol in symbols:
+            # Group the symbol's articles by source
+            by_source = {}
+            for i in sorted(index[symbol] + untagged):
+                by_source.setdefault(all_news[i].get('source'), []).append(i)
+            
+            # Analyze each source
+            source_analysis = {}
+            for source, positions in by_source.items():
+                analysis = self._summarize_source([all_news[i] for i in positions],
+                                                  [sentiments[i] for i in positions if sentiments[i] is not None])
+                if analysis:
+                    source_analysis[source] = analysis
+            
+            results[symbol] = self._summarize_market(symbol, source_analysis)
+        
+        return results
+
+    def get_current_sentiment(self, crypto_symbol: str = "BTC", source: str = None) -> Dict:
+        """
+        Decayed sentiment from the rolling state, without fetching or scoring
+        """
+        if self.sentiment_state is None:
+            return None
+        return self.sentiment_state.get(crypto_symbol, source)
+
     def get_sentiment_summary(self, crypto_symbol: str = "BTC") -> Dict:
         """
         Get a comprehensive sentiment summary
@@ -273,6 +476,10 @@ def test_advanced_sentiment():
     print(f"  Confidence: {result['confidence']}")
     print(f"  Keywords Found: {result['total_keywords']}")
     
+    # Test batch scoring
+    batch = analyzer.analyze_texts([test_text, "Market crash fears grow as liquidation wave hits"] * 300, workers=2, chunk_size=200)
+    print(f"📦 Batch: {len(batch)} rows, mean polarity {batch['polarity'].mean():.3f}")
+    
     # Test source comparison
     print(f"\n🔍 Testing Source Comparison...")
     comparison = analyzer.compare_sources_sentiment("BTC")
@@ -285,6 +492,13 @@ def test_advanced_sentiment():
         for source, analysis in comparison['source_analysis'].items():
             print(f"    {source.upper()}: {analysis['overall_sentiment']} (polarity: {analysis['average_polarity']})")
     
+    # Test multi-symbol comparison (one collection, one scoring pass)
+    print(f"\n🔍 Testing Multi-Symbol Comparison...")
+    for symbol, symbol_comparison in analyzer.compare_symbols_sentiment(["BTC", "ETH", "SOL"]).items():
+        if symbol_comparison:
+            print(f"  {symbol}: {symbol_comparison['market_sentiment']} "
+                  f"(polarity: {symbol_comparison['overall_polarity']}, sources: {symbol_comparison['sources_analyzed']})")
+    
     return analyzer
 
 if __name__ == "__main__":
@@ -0,0 +1,180 @@
+import atexit
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Optional
+
+DEFAULT_CACHE_PATH = 'data/cache/sentiment_cache.sqlite'
+_WHITESPACE = re.compile(r'\s+')
+
+
+def normalize_text(text) -> str:
+    """Lower-case with collapsed whitespace: the form that gets scored and hashed"""
+    return _WHITESPACE.sub(' ', str(text)).strip().lower()
+
+
+def text_key(text) -> str:
+    return hashlib.sha256(normalize_text(text).encode('utf-8')).hexdigest()
+
+
+def lexicon_hash(lexicon: Dict) -> str:
+    return hashlib.sha256(json.dumps(lexicon, sort_keys=True).encode('utf-8')).hexdigest()[:16]
+
+
+class SentimentCache:
+    """
+    Sentiment results keyed by a hash of the normalized text.
+
+    Two tiers: an in-memory LRU in front of a SQLite table that survives
+    restarts. Every entry belongs to a namespace (engine version +
+    lexicon hash), so changing either simply stops old entries from
+    matching; ``purge_stale`` deletes them. Writes are buffered and
+    committed every ``flush_every`` puts, on ``flush()`` and at exit.
+    """
+
+    def __init__(self, path: Optional[str] = DEFAULT_CACHE_PATH, max_entries: int = 10000,
+                 namespace: str = 'default', flush_every: int = 100):
+        self.path = path
+        self.max_entries = max_entries
+        self.namespace = namespace
+        self.flush_every = flush_every
+        self._memory = OrderedDict()
+        self._pending = []
+        self._lock = threading.Lock()
+        self.stats = {'memory_hits': 0, 'disk_hits': 0, 'misses': 0}
+
+        self._db = None
+        if path:
+            try:
+                directory = os.path.dirname(path)
+                if directory:
+                    os.makedirs(directory, exist_ok=True)
+                self._db = sqlite3.connect(path, check_same_thread=False)
+                self._db.execute("PRAGMA journal_mode=WAL")
+                self._db.execute(
+                    "CREATE TABLE IF NOT EXISTS sentiment_cache ("
+                    "namespace TEXT NOT NULL, key TEXT NOT NULL, result TEXT NOT NULL, "
+                    "created_at REAL NOT NULL, PRIMARY KEY (namespace, key))"
+                )
+                self._db.commit()
+                atexit.register(self.flush)
+            except Exception as e:
+                print(f"⚠️ Sentiment cache on disk unavailable, using memory only: {e}")
+                self._db = None
+
+    def set_namespace(self, namespace: str):
+        """Switch namespace (engine or lexicon changed); the memory tier is dropped"""
+        with self._lock:
+            if namespace != self.namespace:
+                self.namespace = namespace
+                self._memory.clear()
+
+    def _remember(self, key, result):
+        self._memory[key] = result
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    def get(self, text) -> Optional[Dict]:
+        key = text_key(text)
+        with self._lock:
+            result = self._memory.get(key)
+            if result is not None:
+                self._memory.move_to_end(key)
+                self.stats['memory_hits'] += 1
+                return dict(result)
+
+            if self._db is not None:
+                row = self._db.execute(
+                    "SELECT result FROM sentiment_cache WHERE namespace = ? AND key = ?",
+                    (self.namespace, key)).fetchone()
+                if row is not None:
+                    result = json.loads(row[0])
+                    self._remember(key, result)
+                    self.stats['disk_hits'] += 1
+                    return dict(result)
+
+            self.stats['misses'] += 1
+            return None
+
+    def put(self, text, result: Dict):
+        if result is None:
+            return
+        key = text_key(text)
+        result = {k: v for k, v in result.items() if k != 'text'}
+        with self._lock:
+            self._remember(key, result)
+            if self._db is not None:
+                self._pending.append((self.namespace, key, json.dumps(result), time.time()))
+                if len(self._pending) >= self.flush_every:
+                    self._flush_locked()
+
+    def _flush_locked(self):
+        if self._db is not None and self._pending:
+            self._db.executemany("INSERT OR REPLACE INTO sentiment_cache VALUES (?, ?, ?, ?)", self._pending)
+            self._db.commit()
+        self._pending = []
+
+    def flush(self):
+        with self._lock:
+            try:
+                self._flush_locked()
+            except Exception as e:
+                print(f"❌ Error writing sentiment cache: {e}")
+
+    def purge_stale(self) -> int:
+        """Delete disk entries from other namespaces; returns rows removed"""
+        if self._db is None:
+            return 0
+        with self._lock:
+            self._flush_locked()
+            removed = self._db.execute("DELETE FROM sentiment_cache WHERE namespace != ?", (self.namespace,)).rowcount
+            self._db.commit()
+        return removed
+
+    def clear(self):
+        with self._lock:
+            self._memory.clear()
+            self._pending = []
+            if self._db is not None:
+                self._db.execute("DELETE FROM sentiment_cache")
+                self._db.commit()
+
+    def get_stats(self) -> Dict:
+        hits = self.stats['memory_hits'] + self.stats['disk_hits']
+        total = hits + self.stats['misses']
+        return dict(self.stats, hit_rate=round(hits / total, 3) if total else 0.0,
+                    memory_entries=len(self._memory), namespace=self.namespace)
+
+# Test function
+def test_sentiment_cache():
+    """Test the two-tier sentiment cache"""
+    import tempfile
+
+    print("🧪 Testing Sentiment Cache...")
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'cache.sqlite')
+        cache = SentimentCache(path, namespace='v1')
+        cache.put("Bitcoin  rallies!", {'text': "Bitcoin  rallies!", 'polarity': 0.5})
+        cache.flush()
+
+        # A new process only has the disk tier
+        reopened = SentimentCache(path, namespace='v1')
+        print(f"  Disk hit: {reopened.get('bitcoin rallies!')}")
+        print(f"  Memory hit: {reopened.get('BITCOIN RALLIES!')}")
+
+        reopened.set_namespace('v2')
+        print(f"  After namespace change: {reopened.get('bitcoin rallies!')}")
+        print(f"  Stale rows purged: {reopened.purge_stale()}")
+        print(f"📊 Stats: {reopened.get_stats()}")
+
+    return reopened
+
+if __name__ == "__main__":
+    test_sentiment_cache()
@@ -0,0 +1,249 @@
+import json
+import math
+import os
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime
+from typing import Dict, Optional
+
+try:
+    from .sentiment_cache import text_key
+    from .deduplication import item_text
+except ImportError:
+    from sentiment_cache import text_key
+    from deduplication import item_text
+
+DEFAULT_STATE_PATH = 'data/cache/sentiment_state.json'
+TIMESTAMP_FIELDS = ('timestamp', 'publish_time', 'published_at', 'created_at')
+
+
+def to_epoch_seconds(value) -> Optional[float]:
+    """datetime / pandas Timestamp / ISO string / epoch seconds or milliseconds -> epoch seconds"""
+    if value is None:
+        return None
+    if isinstance(value, datetime):
+        return value.timestamp()
+    if isinstance(value, (int, float)):
+        # Binance style millisecond timestamps
+        return value / 1000.0 if value > 1e11 else float(value)
+    try:
+        return datetime.fromisoformat(str(value).replace('Z', '+00:00')).timestamp()
+    except ValueError:
+        return None
+
+
+def item_time(item: Dict) -> float:
+    """Event time of a news item in epoch seconds (now when it carries none)"""
+    for field in TIMESTAMP_FIELDS:
+        seconds = to_epoch_seconds(item.get(field))
+        if seconds is not None:
+            return seconds
+    return time.time()
+
+
+class DecayedSentimentState:
+    """
+    Rolling sentiment per (symbol, source) with exponential time decay.
+
+    Each key keeps [weight, mean, spread, count, last_time]: the decayed
+    sum of item weights, the decayed weighted mean polarity, the decayed
+    sum of squared deviations (variance = spread / weight), the raw item
+    count and the time the state was last decayed to. An item's weight
+    halves every ``half_life`` seconds, so an update is O(1) and a query
+    only decays the weight to the query time. Items older than the state
+    (out of order) are down-weighted by their age instead.
+
+    Items already folded in are recognized by source + text among the
+    last ``max_seen`` items, so re-collected news is not counted twice.
+    """
+
+    def __init__(self, half_life: float = 3600.0, path: Optional[str] = DEFAULT_STATE_PATH,
+                 checkpoint_every: int = 500, max_seen: int = 50000):
+        self.half_life = half_life
+        self.decay_rate = math.log(2) / half_life
+        self.path = path
+        self.checkpoint_every = checkpoint_every
+        self.max_seen = max_seen
+        self.state = {}
+        self._seen = OrderedDict()
+        self._updates_since_checkpoint = 0
+        self._lock = threading.RLock()
+        self.load()
+
+    def _decay(self, entry, timestamp: float):
+        """Decay an entry forward to ``timestamp`` (in place)"""
+        if timestamp > entry[4]:
+            factor = math.exp(-self.decay_rate * (timestamp - entry[4]))
+            entry[0] *= factor
+            entry[2] *= factor
+            entry[4] = timestamp
+
+    def update_value(self, symbol: str, source: str, polarity: float, timestamp: float = None, weight: float = 1.0):
+        """Fold one polarity observation into the (symbol, source) state"""
+        timestamp = time.time() if timestamp is None else timestamp
+        with self._lock:
+            entry = self.state.get((symbol, source))
+            if entry is None:
+                entry = self.state[(symbol, source)] = [0.0, 0.0, 0.0, 0, timestamp]
+            self._decay(entry, timestamp)
+            weight *= math.exp(-self.decay_rate * (entry[4] - timestamp))
+            if weight <= 0:
+                return
+
+            # Weighted Welford update
+            total = entry[0] + weight
+            delta = polarity - entry[1]
+            entry[1] += delta * weight / total
+            entry[2] += weight * delta * (polarity - entry[1])
+            entry[0] = total
+            entry[3] += 1
+
+            self._updates_since_checkpoint += 1
+            if self.checkpoint_every and self._updates_since_checkpoint >= self.checkpoint_every:
+                self.save()
+
+    def update(self, item: Dict):
+        """Fold a scored news item in (pipeline aggregator interface)"""
+        if item.get('polarity') is None:
+            return
+        source = item.get('source', 'unknown')
+        key = text_key(f"{source} {item.get('text') or item_text(item)}")
+        with self._lock:
+            if key in self._seen:
+                return
+            self._seen[key] = None
+            if len(self._seen) > self.max_seen:
+                self._seen.popitem(last=False)
+
+            timestamp = item_time(item)
+            for symbol in item.get('symbols') or ['ALL']:
+                self.update_value(symbol, source, item['polarity'], timestamp)
+
+    def _summarize(self, weight, mean, spread, count, last_time, now) -> Dict:
+        # Decay scales weight and spread alike, so the variance is unchanged
+        variance = spread / weight if weight > 0 else 0.0
+        weight *= math.exp(-self.decay_rate * max(now - last_time, 0))
+        return {
+            'mean': round(mean, 4),
+            'weight': round(weight, 4),
+            'std': round(math.sqrt(max(variance, 0.0)), 4),
+            'count': count,
+            'last_update': datetime.fromtimestamp(last_time).isoformat(),
+            'age_seconds': round(max(now - last_time, 0), 1)
+        }
+
+    def get(self, symbol: str, source: str = None, now: float = None) -> Optional[Dict]:
+        """
+        Current sentiment for a symbol: one source, or all of its sources
+        merged. Returns mean, decayed weight, std, count and age.
+        """
+        now = time.time() if now is None else now
+        with self._lock:
+            entries = [list(entry) for (entry_symbol, entry_source), entry in self.state.items()
+                       if entry_symbol == symbol and (source is None or entry_source == source)]
+        if not entries:
+            return None
+
+        # Bring every source to the same time, then merge (parallel variance formula)
+        latest = max(entry[4] for entry in entries)
+        weight, mean, spread, count = 0.0, 0.0, 0.0, 0
+        for entry in entries:
+            self._decay(entry, latest)
+            if entry[0] <= 0:
+                continue
+            total = weight + entry[0]
+            delta = entry[1] - mean
+            spread += entry[2] + delta * delta * weight * entry[0] / total
+            mean += delta * entry[0] / total
+            weight = total
+            count += entry[3]
+        return self._summarize(weight, mean, spread, count, latest, now)
+
+    def snapshot(self, now: float = None) -> Dict:
+        """{symbol: {source: get(symbol, source)}} decayed to ``now``"""
+        now = time.time() if now is None else now
+        with self._lock:
+            entries = {key: list(entry) for key, entry in self.state.items()}
+        result = {}
+        for (symbol, source), entry in entries.items():
+            result.setdefault(symbol, {})[source] = self._summarize(*entry, now)
+        return result
+
+    def save(self):
+        """Checkpoint the state atomically"""
+        with self._lock:
+            self._updates_since_checkpoint = 0
+            if not self.path:
+                return
+            try:
+                directory = os.path.dirname(self.path)
+                if directory:
+                    os.makedirs(directory, exist_ok=True)
+                checkpoint = {
+                    'half_life': self.half_life,
+                    'state': [[symbol, source] + entry for (symbol, source), entry in self.state.items()],
+                    'seen': list(self._seen)
+                }
+                tmp_path = self.path + '.tmp'
+                with open(tmp_path, 'w', encoding='utf-8') as f:
+                    json.dump(checkpoint, f)
+                os.replace(tmp_path, self.path)
+            except Exception as e:
+                print(f"❌ Error saving sentiment state: {e}")
+
+    def load(self):
+        """Restore a checkpoint (ignored when written with another half-life)"""
+        if not self.path or not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                checkpoint = json.load(f)
+            if checkpoint.get('half_life') != self.half_life:
+                print(f"⚠️ Sentiment state checkpoint has another half-life, starting fresh")
+                return
+            with self._lock:
+                self.state = {(row[0], row[1]): row[2:] for row in checkpoint.get('state', [])}
+                self._seen = OrderedDict((key, None) for key in checkpoint.get('seen', [])[-self.max_seen:])
+        except Exception as e:
+            print(f"❌ Error loading sentiment state: {e}")
+
+    def reset(self):
+        with self._lock:
+            self.state = {}
+            self._seen.clear()
+            self._updates_since_checkpoint = 0
+
+# Test function
+def test_sentiment_state():
+    """Test decayed sentiment state"""
+    import tempfile
+
+    print("🧪 Testing Decayed Sentiment State...")
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'state.json')
+        state = DecayedSentimentState(half_life=3600, path=path)
+        start = time.time() - 4 * 3600
+
+        # Bearish four hours ago, bullish in the last hour
+        for minute in range(0, 240, 10):
+            polarity = -0.5 if minute < 180 else 0.6
+            state.update({'source': 'twitter', 'symbols': ['BTC'], 'polarity': polarity,
+                          'text': f'tweet {minute}', 'timestamp': start + minute * 60})
+        state.update({'source': 'binance', 'symbols': ['BTC', 'ETH'], 'polarity': 0.3,
+                      'title': 'Listing announced', 'publish_time': datetime.now()})
+        state.update({'source': 'binance', 'symbols': ['BTC', 'ETH'], 'polarity': 0.3,
+                      'title': 'Listing announced', 'publish_time': datetime.now()})  # re-collected
+
+        print(f"  BTC/twitter: {state.get('BTC', 'twitter')}")
+        print(f"  BTC (all sources): {state.get('BTC')}")
+        state.save()
+
+        restored = DecayedSentimentState(half_life=3600, path=path)
+        print(f"  Restored ETH: {restored.get('ETH')}")
+
+    return state
+
+if __name__ == "__main__":
+    test_sentiment_state()
@@ -0,0 +1,161 @@
+import os
+import threading
+from typing import Dict, Iterable, List, Optional
+
+import pandas as pd
+
+try:
+    from .sentiment_state import to_epoch_seconds, item_time
+except ImportError:
+    from sentiment_state import to_epoch_seconds, item_time
+
+DEFAULT_STORE_PATH = 'data/sentiment/store'
+STORE_COLUMNS = ['timestamp', 'symbol', 'source', 'polarity', 'confidence', 'sentiment', 'title']
+# A row is the same item when these match; appends skip rows already stored
+KEY_COLUMNS = ['timestamp', 'symbol', 'source', 'title']
+
+
+def _row_keys(frame: pd.DataFrame) -> pd.MultiIndex:
+    return pd.MultiIndex.from_arrays([
+        pd.to_datetime(frame['timestamp'], format='ISO8601').astype('datetime64[ns]'),
+        frame['symbol'].astype(str), frame['source'].astype(str), frame['title'].fillna('').astype(str)
+    ])
+
+
+class SentimentStore:
+    """
+    Scored news as a time series, one CSV per symbol and UTC day:
+
+        <root>/<SYMBOL>/<YYYY-MM-DD>.csv
+
+    Timestamps are stored as naive UTC, like the price data. Reads only
+    open the partitions inside the requested date range. Appends are
+    idempotent: rows already in a partition (same KEY_COLUMNS) are
+    skipped, so replaying a batch does not duplicate it.
+    """
+
+    def __init__(self, root: str = DEFAULT_STORE_PATH):
+        self.root = root
+        self._lock = threading.Lock()
+        print(f"✅ Sentiment Store Initialized ({root})")
+
+    def _partition_path(self, symbol: str, day: str) -> str:
+        return os.path.join(self.root, symbol.upper(), f"{day}.csv")
+
+    def to_frame(self, items: Iterable[Dict]) -> pd.DataFrame:
+        """One row per (scored item, symbol); untagged items are stored under ALL"""
+        rows = []
+        for item in items:
+            if item.get('polarity') is None:
+                continue
+            timestamp = item_time(item)
+            for symbol in item.get('symbols') or ['ALL']:
+                rows.append((timestamp, symbol.upper(), item.get('source', 'unknown'), item['polarity'],
+                             item.get('confidence'), item.get('sentiment'),
+                             str(item.get('title') or item.get('text') or item.get('content', ''))[:200]))
+        frame = pd.DataFrame(rows, columns=STORE_COLUMNS)
+        frame['timestamp'] = pd.to_datetime(frame['timestamp'], unit='s')
+        return frame
+
+    def append(self, records) -> int:
+        """
+        Append scored items (dicts) or a DataFrame with STORE_COLUMNS.
+        Returns the number of new rows written.
+        """
+        frame = records if isinstance(records, pd.DataFrame) else self.to_frame(records)
+        if frame.empty:
+            return 0
+        frame = frame.copy()
+        if not pd.api.types.is_datetime64_any_dtype(frame['timestamp']):
+            frame['timestamp'] = pd.to_datetime([to_epoch_seconds(value) for value in frame['timestamp']], unit='s')
+        frame = frame.reindex(columns=STORE_COLUMNS)
+        frame = frame[~_row_keys(frame).duplicated()]
+
+        written = 0
+        with self._lock:
+            for (symbol, day), partition in frame.groupby([frame['symbol'], frame['timestamp'].dt.strftime('%Y-%m-%d')]):
+                path = self._partition_path(symbol, day)
+                if os.path.exists(path):
+                    stored = pd.read_csv(path, usecols=KEY_COLUMNS, dtype=str, keep_default_na=False)
+                    partition = partition[~_row_keys(partition).isin(_row_keys(stored))]
+                    if partition.empty:
+                        continue
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                partition.to_csv(path, mode='a', header=not os.path.exists(path), index=False)
+                written += len(partition)
+        return written
+
+    def symbols(self) -> List[str]:
+        if not os.path.isdir(self.root):
+            return []
+        return sorted(name for name in os.listdir(self.root) if os.path.isdir(os.path.join(self.root, name)))
+
+    def load(self, symbol: str, start=None, end=None, sources: Optional[List[str]] = None,
+             include_untagged: bool = False) -> pd.DataFrame:
+        """
+        Scored items for a symbol sorted by timestamp, optionally limited to
+        [start, end] and some sources. ``include_untagged`` adds the ALL series.
+        """
+        start = pd.Timestamp(start) if start is not None else None
+        end = pd.Timestamp(end) if end is not None else None
+        symbols = [symbol.upper()] + (['ALL'] if include_untagged and symbol.upper() != 'ALL' else [])
+
+        frames = []
+        for name in symbols:
+            directory = os.path.join(self.root, name)
+            if not os.path.isdir(directory):
+                continue
+            for filename in sorted(os.listdir(directory)):
+                if not filename.endswith('.csv'):
+                    continue
+                day = pd.Timestamp(filename[:-4])
+                if (start is not None and day < start.normalize()) or (end is not None and day > end):
+                    continue
+                try:
+                    frames.append(pd.read_csv(os.path.join(directory, filename)))
+                except Exception as e:
+                    print(f"❌ Error reading sentiment partition {name}/{filename}: {e}")
+
+        if not frames:
+            return pd.DataFrame(columns=STORE_COLUMNS)
+        data = pd.concat(frames, ignore_index=True)
+        data['timestamp'] = pd.to_datetime(data['timestamp'], format='ISO8601')
+        # Partitions written before appends were idempotent may hold repeats
+        data = data[~_row_keys(data).duplicated()]
+        if start is not None:
+            data = data[data['timestamp'] >= start]
+        if end is not None:
+            data = data[data['timestamp'] <= end]
+        if sources:
+            data = data[data['source'].isin(sources)]
+        return data.sort_values('timestamp', kind='stable').reset_index(drop=True)
+
+# Test function
+def test_sentiment_store():
+    """Test the partitioned sentiment store"""
+    import tempfile
+    from datetime import datetime, timedelta
+
+    print("🧪 Testing Sentiment Store...")
+
+    with tempfile.TemporaryDirectory() as directory:
+        store = SentimentStore(directory)
+        now = datetime(2024, 3, 1, 22, 0)
+        items = [
+            {'source': 'binance', 'symbols': ['BTC'], 'title': 'ETF inflows hit record', 'polarity': 0.4,
+             'confidence': 0.6, 'sentiment': 'BULLISH', 'publish_time': now},
+            {'source': 'twitter', 'symbols': ['BTC', 'ETH'], 'content': 'Liquidations everywhere', 'polarity': -0.5,
+             'confidence': 0.7, 'sentiment': 'BEARISH', 'created_at': now + timedelta(hours=3)},
+            {'source': 'crypto_news', 'title': 'Markets quiet', 'polarity': 0.0, 'published_at': now},
+        ]
+        written = store.append(items)
+        print(f"  Rows written: {written}, symbols: {store.symbols()}")
+        assert store.append(items) == 0  # replaying a batch adds nothing
+        btc = store.load('BTC', start='2024-03-02')
+        print(f"  BTC from 2024-03-02: {len(btc)} rows")
+        print(store.load('BTC', include_untagged=True)[['timestamp', 'symbol', 'source', 'polarity']])
+
+    return store
+
+if __name__ == "__main__":
+    test_sentiment_store()
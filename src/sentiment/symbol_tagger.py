@@ -0,0 +1,121 @@
+from typing import Dict, Iterable, List
+
+try:
+    from .lexicon_matcher import LexiconMatcher
+except ImportError:
+    from lexicon_matcher import LexiconMatcher
+
+QUOTE_ASSETS = ('FDUSD', 'USDT', 'BUSD', 'USDC', 'TUSD', 'USD')
+
+# ticker -> names and aliases
+DEFAULT_UNIVERSE = {
+    'BTC': ['bitcoin', 'xbt'],
+    'ETH': ['ethereum', 'ether'],
+    'BNB': ['binance coin'],
+    'ADA': ['cardano'],
+    'SOL': ['solana'],
+    'DOT': ['polkadot'],
+    'XRP': ['ripple'],
+    'DOGE': ['dogecoin'],
+    'MATIC': ['polygon'],
+    'LTC': ['litecoin'],
+    'AVAX': ['avalanche'],
+    'LINK': ['chainlink'],
+}
+
+# Tickers that are also everyday words: only matched in upper case or as cashtags
+AMBIGUOUS_TICKERS = {'LINK', 'DOT', 'SOL', 'ONE', 'NEAR', 'GAS', 'FUN', 'BAND', 'MASK', 'GAL', 'ACE', 'ID', 'OM', 'OP'}
+
+
+def base_asset(pair: str) -> str:
+    """'BTCUSDT' -> 'BTC' (symbols without a known quote asset are returned as is)"""
+    pair = pair.upper()
+    for quote in QUOTE_ASSETS:
+        if pair.endswith(quote) and len(pair) > len(quote):
+            return pair[:-len(quote)]
+    return pair
+
+
+class SymbolTagger:
+    """
+    Finds the assets a text mentions, in one pass over the text.
+
+    Built once from a universe of tickers with their names and aliases:
+    names, aliases, cashtags ("$btc") and ordinary tickers match in any
+    case; ambiguous tickers ("LINK", "DOT", or anything of two letters
+    or fewer) only match in upper case or as cashtags. Matching uses
+    LexiconMatcher automata, so the cost does not grow with the number
+    of assets.
+    """
+
+    def __init__(self, universe: Dict[str, Iterable[str]] = None, ambiguous: Iterable[str] = AMBIGUOUS_TICKERS):
+        universe = DEFAULT_UNIVERSE if universe is None else universe
+        ambiguous = {ticker.upper() for ticker in ambiguous}
+
+        anycase_terms = []
+        upper_terms = []
+        for ticker, aliases in universe.items():
+            ticker = ticker.upper()
+            anycase_terms.append((f"${ticker}", ticker))
+            if ticker in ambiguous or len(ticker) <= 2:
+                upper_terms.append((ticker, ticker))
+            else:
+                anycase_terms.append((ticker, ticker))
+            anycase_terms.extend((alias, ticker) for alias in aliases or [])
+
+        self.universe = {ticker.upper(): list(aliases or []) for ticker, aliases in universe.items()}
+        self._anycase = LexiconMatcher(anycase_terms)
+        self._upper = LexiconMatcher(upper_terms, case_sensitive=True)
+        print(f"✅ Symbol Tagger Initialized ({len(self.universe)} assets)")
+
+    @classmethod
+    def from_pairs(cls, pairs: Iterable[str], names: Dict[str, Iterable[str]] = None, **kwargs):
+        """Universe from trading pairs ('BTCUSDT', ...), with names for known tickers"""
+        names = DEFAULT_UNIVERSE if names is None else names
+        universe = {}
+        for pair in pairs:
+            ticker = base_asset(pair)
+            universe[ticker] = list(names.get(ticker, []))
+        return cls(universe, **kwargs)
+
+    def tag(self, text: str) -> List[str]:
+        """Tickers mentioned in the text, in order of first mention"""
+        if not text:
+            return []
+        matches = self._anycase.find(text) + self._upper.find(text)
+        matches.sort(key=lambda match: match[0])
+        return list(dict.fromkeys(match[3] for match in matches))
+
+    def tag_many(self, texts: Iterable[str]) -> List[List[str]]:
+        return [self.tag(text) for text in texts]
+
+# Test function
+def test_symbol_tagger():
+    """Test symbol tagging"""
+    import time
+
+    print("🧪 Testing Symbol Tagger...")
+
+    tagger = SymbolTagger()
+    samples = [
+        "Bitcoin ETF approval expected soon while Ethereum lags",
+        "$sol and $link pump; btc flat",
+        "Click the link to see the dot plot",          # no assets
+        "LINK and DOT rally as Polygon upgrade ships",
+    ]
+    for text in samples:
+        print(f"  {tagger.tag(text)} <- {text}")
+
+    # A large universe costs about the same per text
+    universe = dict(DEFAULT_UNIVERSE, **{f"TKN{i}": [f"token number {i}"] for i in range(5000)})
+    large = SymbolTagger(universe)
+    start = time.time()
+    for _ in range(200):
+        for text in samples:
+            large.tag(text)
+    print(f"📊 {len(universe)} assets: {len(samples) * 200 / (time.time() - start):.0f} texts/s")
+
+    return tagger
+
+if __name__ == "__main__":
+    test_symbol_tagger()
@@ -1,7 +1,7 @@
 import logging
 import os
 import pandas as pd
-from datetime import datetime
+from datetime import datetime, timezone
 import json
 import sys
 
@@ -69,7 +69,8 @@ class ProjectLogger:
         movement_text = movement.replace('📈', 'UP').replace('📉', 'DOWN')
         
         log_entry = {
-            'timestamp': datetime.now().isoformat(),
+            # UTC with offset, so predictions line up with kline times
+            'timestamp': datetime.now(timezone.utc).isoformat(),
             'symbol': symbol,
             'prediction': prediction_result.get('prediction', 'N/A'),
             'movement': movement_text,